@@ -1,33 +1,37 @@
+import asyncio
 import logging
-import os
 import platform
 from datetime import datetime
 from typing import Dict, Any
 
 from fastapi import APIRouter, HTTPException
 
-from app.services.bloomberg_service import bloomberg_service
+from app.db.connection import health_check as db_health_check
+from app.services.status_cache import get_cached_status
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/health", tags=["health"])
 
+# Runtime details don't change while the process is up
+_ENVIRONMENT = {
+    "python_version": platform.python_version(),
+    "platform": platform.system(),
+}
+
 
 @router.get("/")
 async def health_check() -> Dict[str, Any]:
     """Health check endpoint"""
     
     # Get Bloomberg connection status
-    bloomberg_status = bloomberg_service.get_connection_status()
+    bloomberg_status = get_cached_status()
     
     return {
         "status": "healthy" if bloomberg_status["is_connected"] else "degraded",
         "timestamp": datetime.utcnow().isoformat(),
         "version": "1.0.0",
-        "environment": {
-            "python_version": platform.python_version(),
-            "platform": platform.system(),
-        },
+        "environment": _ENVIRONMENT,
         "bloomberg": bloomberg_status,
         "mode": "live_bloomberg_only",  # Only live data supported
     }
@@ -37,9 +41,7 @@ async def health_check() -> Dict[str, Any]:
 async def database_health() -> Dict[str, Any]:
     """Database health check"""
     try:
-        from ..db.connection import health_check
-
-        return health_check()
+        return await asyncio.to_thread(db_health_check)
     except Exception as e:
         logger.error(f"Database health check failed: {e}")
         raise HTTPException(status_code=503, detail="Database unavailable")
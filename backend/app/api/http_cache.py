@@ -0,0 +1,43 @@
+"""
+HTTP caching helpers for frequently polled endpoints
+Adds ETag / Cache-Control headers and answers matching If-None-Match with 304
+"""
+
+import hashlib
+from typing import Any, Sequence
+
+import orjson
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+# Cache-Control for price data polled every few seconds by the dashboard
+PRICE_CACHE_CONTROL = "public, max-age=2, stale-while-revalidate=5"
+
+
+def cached_json_response(
+    request: Request,
+    payload: Any,
+    cache_control: str = PRICE_CACHE_CONTROL,
+    etag_exclude: Sequence[str] = (),
+) -> Response:
+    """Serialize payload with an ETag, returning 304 if the client already has it
+
+    Fields named in etag_exclude (for a list of rows) are left out of the ETag,
+    so a per-response value like the serving time doesn't defeat the 304
+    """
+    content = jsonable_encoder(payload)
+    body = orjson.dumps(content)
+    if etag_exclude:
+        tagged = orjson.dumps(
+            [{k: v for k, v in row.items() if k not in etag_exclude} for row in content]
+        )
+    else:
+        tagged = body
+    etag = f'"{hashlib.blake2b(tagged, digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,12 +1,19 @@
+import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+import time
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any, Tuple
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from pydantic import BaseModel
 
+from .http_cache import cached_json_response
 from ..models.ticker import Ticker, TickerCreate
-from ..services.bloomberg_service import bloomberg_service
+from ..services import bloomberg_batcher as batcher
+from ..services import price_refresher, quote_cache
+from ..services.bloomberg_service import get_bloomberg_service
+from ..services.market_hours import lme_state
 from ..services.ticker_service import TickerService
 from ..db.lme_tickers import get_lme_tickers, get_bloomberg_symbols
 
@@ -16,6 +23,14 @@ router = APIRouter(prefix="/lme", tags=["lme"])
 # Initialize services
 ticker_service = TickerService()
 
+# Shared read-only "no live price" placeholder
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+# Lowercased (symbol, description, category, ticker) rows used by /search,
+# rebuilt whenever the ticker table version changes
+_SEARCH_INDEX: List[Tuple[str, str, str, Ticker]] = []
+_INDEX_VERSION = -1
+
 class LMETickerData(BaseModel):
     """LME ticker data with live Bloomberg prices"""
     id: int  # Add database ID for deletion
@@ -47,38 +62,62 @@ class TickerSearchResult(BaseModel):
 
 @router.get("/tickers", response_model=List[LMETickerData])
 async def get_lme_tickers_with_prices(
+    request: Request,
     include_live_prices: bool = Query(default=True, description="Include live Bloomberg prices")
-) -> List[LMETickerData]:
+) -> Response:
     """
     Get all tickers with optional live Bloomberg prices
     """
     try:
         # Get all tickers from database (not just LME/metals)
-        db_tickers = ticker_service.get_all_tickers()
+        db_tickers = await asyncio.to_thread(ticker_service.get_all_tickers)
         
         # If no tickers in DB, initialize with default LME tickers for demo purposes
         if not db_tickers:
             logger.info("No tickers found in database, initializing defaults...")
-            await initialize_default_lme_tickers()
-            db_tickers = ticker_service.get_all_tickers()
+            db_tickers = await asyncio.to_thread(initialize_default_lme_tickers)
+
+        # Response rows are built from trusted DB/Bloomberg data, so skip
+        # per-row validation with model_construct
 
-        # Get live prices if requested
+        # Metadata-only listing: skip Bloomberg and per-row price lookups
+        if not include_live_prices:
+            return cached_json_response(request, [
+                LMETickerData.model_construct(
+                    id=ticker.id,
+                    ticker=ticker.symbol,
+                    description=ticker.description,
+                    metal=extract_metal_from_symbol(ticker.symbol),
+                    symbol=ticker.product_category or "OTHER",
+                    bloomberg_symbol=ticker.symbol,
+                )
+                for ticker in db_tickers
+            ])
+
+        # Get live prices
         live_prices = {}
-        if include_live_prices and db_tickers:
+        if db_tickers:
             bloomberg_symbols = [ticker.symbol for ticker in db_tickers]
             try:
-                price_data = bloomberg_service.get_real_time_data(bloomberg_symbols)
-                live_prices = {item["symbol"]: item for item in price_data}
+                # Prefer the background refresher's snapshot; fall back to an
+                # on-demand fetch when it isn't running
+                snapshot = price_refresher.get_snapshot()
+                if snapshot is not None:
+                    live_prices = snapshot
+                else:
+                    live_prices, misses = quote_cache.get_many(bloomberg_symbols)
+                    if misses:
+                        fetched = await batcher.get_quotes(misses)
+                        quote_cache.set_many(time.monotonic(), fetched)
+                        live_prices.update(fetched)
                 logger.info(f"Retrieved live prices for {len(live_prices)} tickers")
             except Exception as e:
                 logger.error(f"Error fetching live prices: {e}")
         
         # Build response
-        result = []
-        for ticker in db_tickers:
-            price_info = live_prices.get(ticker.symbol, {})
-            
-            result.append(LMETickerData(
+        now = datetime.now(timezone.utc)
+        result = [
+            LMETickerData.model_construct(
                 id=ticker.id,
                 ticker=ticker.symbol,
                 description=ticker.description,
@@ -88,11 +127,15 @@ async def get_lme_tickers_with_prices(
                 px_last=price_info.get("px_last"),
                 change=price_info.get("change"),
                 change_pct=price_info.get("change_pct"),
-                timestamp=datetime.now(timezone.utc) if price_info else None,
+                timestamp=now if price_info else None,
                 is_live=bool(price_info)  # All data is live since dummy data is removed
-            ))
+            )
+            for ticker in db_tickers
+            for price_info in (live_prices.get(ticker.symbol, _EMPTY),)
+        ]
         
-        return result
+        # Rows are stamped with the serving time, which must not change the ETag
+        return cached_json_response(request, result, etag_exclude=("timestamp",))
         
     except Exception as e:
         logger.error(f"Error fetching tickers: {e}")
@@ -109,8 +152,15 @@ async def add_bloomberg_ticker(request: AddTickerRequest) -> Dict[str, str]:
         # Validate ticker exists in Bloomberg
         logger.info(f"Validating Bloomberg ticker: {request.bloomberg_symbol}")
         
-        # Try to get data from Bloomberg to validate ticker
-        price_data = bloomberg_service.get_real_time_data([request.bloomberg_symbol])
+        # Validate against Bloomberg while checking the database in parallel
+        price_data, existing_ticker = await asyncio.gather(
+            asyncio.to_thread(
+                get_bloomberg_service().get_real_time_data, [request.bloomberg_symbol]
+            ),
+            asyncio.to_thread(
+                ticker_service.get_ticker_by_symbol, request.bloomberg_symbol
+            ),
+        )
         
         # Require valid price data from Bloomberg to consider ticker valid
         if not price_data or not price_data[0] or price_data[0].get("px_last") is None:
@@ -125,8 +175,6 @@ async def add_bloomberg_ticker(request: AddTickerRequest) -> Dict[str, str]:
         # Use Bloomberg category if available, otherwise use provided or default to "OTHER"
         product_category = price_data[0].get("product_category") or request.symbol or "OTHER"
         
-        # Check if ticker already exists
-        existing_ticker = ticker_service.get_ticker_by_symbol(request.bloomberg_symbol)
         if existing_ticker:
             return {
                 "status": "already_exists",
@@ -134,13 +182,19 @@ async def add_bloomberg_ticker(request: AddTickerRequest) -> Dict[str, str]:
                 "ticker_id": str(existing_ticker.id)
             }
         
-        # Create new ticker with minimal required data
-        new_ticker = ticker_service.create_ticker(TickerCreate(
+        # Insert unless added concurrently (one round-trip, no check/insert race)
+        new_ticker, created = await asyncio.to_thread(ticker_service.upsert_ticker, TickerCreate(
             symbol=request.bloomberg_symbol,
             description=description,
             product_category=product_category,
             is_custom=True
         ))
+        if not created:
+            return {
+                "status": "already_exists",
+                "message": f"Ticker {request.bloomberg_symbol} already exists in database",
+                "ticker_id": str(new_ticker.id)
+            }
         
         logger.info(f"Successfully added Bloomberg ticker: {request.bloomberg_symbol}")
         
@@ -162,7 +216,7 @@ async def add_bloomberg_ticker(request: AddTickerRequest) -> Dict[str, str]:
 async def delete_lme_ticker(ticker_id: int) -> Dict[str, str]:
     """Delete an LME ticker from tracking"""
     try:
-        success = ticker_service.delete_ticker(ticker_id)
+        success = await asyncio.to_thread(ticker_service.delete_ticker, ticker_id)
         if not success:
             raise HTTPException(status_code=404, detail="Ticker not found")
         
@@ -183,10 +237,7 @@ async def get_lme_market_status() -> Dict[str, Any]:
         current_time = datetime.now(timezone.utc)
         
         # LME trades Monday-Friday, roughly 01:00-19:00 GMT
-        is_weekend = current_time.weekday() >= 5
-        hour = current_time.hour
-        
-        is_open = not is_weekend and 1 <= hour <= 19
+        is_open = lme_state(current_time).is_open
         
         return {
             "is_open": is_open,
@@ -200,66 +251,82 @@ async def get_lme_market_status() -> Dict[str, Any]:
         logger.error(f"Error getting LME market status: {e}")
         raise HTTPException(status_code=500, detail=f"Error getting market status: {str(e)}")
 
-async def initialize_default_lme_tickers():
-    """Initialize database with default LME tickers"""
+def initialize_default_lme_tickers() -> List[Ticker]:
+    """Initialize database with default LME tickers, returning all tickers"""
     try:
-        default_tickers = get_lme_tickers()
-        
-        for ticker_data in default_tickers:
-            try:
-                # Check if ticker already exists
-                existing = ticker_service.get_ticker_by_symbol(ticker_data["bloomberg_symbol"])
-                if not existing:
-                    ticker_service.create_ticker(TickerCreate(
-                        symbol=ticker_data["bloomberg_symbol"],
-                        description=ticker_data["description"],
-                        product_category="LME_BASE_METALS",
-                        is_custom=False
-                    ))
-                    logger.info(f"Added default LME ticker: {ticker_data['bloomberg_symbol']}")
-            except Exception as e:
-                logger.error(f"Error adding default ticker {ticker_data['bloomberg_symbol']}: {e}")
-                
+        existing_symbols = ticker_service.get_all_symbols()
+        missing = [
+            TickerCreate(
+                symbol=ticker_data["bloomberg_symbol"],
+                description=ticker_data["description"],
+                product_category="LME_BASE_METALS",
+                is_custom=False
+            )
+            for ticker_data in get_lme_tickers()
+            if ticker_data["bloomberg_symbol"] not in existing_symbols
+        ]
+
+        created = ticker_service.create_tickers(missing)
+        for ticker in created:
+            logger.info(f"Added default LME ticker: {ticker.symbol}")
+
         logger.info("Default LME tickers initialization completed")
-        
+        # Re-read rather than trust `created`: a concurrent cold start may have
+        # seeded some of the defaults first
+        return ticker_service.get_all_tickers()
+
     except Exception as e:
         logger.error(f"Error initializing default LME tickers: {e}")
+        return []
+
+# Bloomberg symbol prefix (always 4 characters) -> metal / short symbol
+_METAL_BY_PREFIX = {
+    "LMAH": "Aluminium",
+    "LMCA": "Copper",
+    "LMNI": "Nickel",
+    "LMPB": "Lead",
+    "LMSN": "Tin",
+    "LMZN": "Zinc",
+    "LMZS": "Zinc"  # Alternative zinc code
+}
+
+_SYMBOL_BY_PREFIX = {
+    "LMAH": "AH",
+    "LMCA": "CA",
+    "LMNI": "NI",
+    "LMPB": "PB",
+    "LMSN": "SN",
+    "LMZN": "ZN",
+    "LMZS": "ZN"
+}
 
 def extract_metal_from_symbol(bloomberg_symbol: str) -> str:
     """Extract metal name from Bloomberg symbol"""
-    metal_map = {
-        "LMAH": "Aluminium",
-        "LMCA": "Copper", 
-        "LMNI": "Nickel",
-        "LMPB": "Lead",
-        "LMSN": "Tin",
-        "LMZN": "Zinc",
-        "LMZS": "Zinc"  # Alternative zinc code
-    }
-    
-    for code, metal in metal_map.items():
-        if bloomberg_symbol.startswith(code):
-            return metal
-    
-    return "Unknown"
+    return _METAL_BY_PREFIX.get(bloomberg_symbol[:4], "Unknown")
 
 def extract_symbol_from_bloomberg(bloomberg_symbol: str) -> str:
     """Extract short symbol from Bloomberg symbol"""
-    symbol_map = {
-        "LMAH": "AH",
-        "LMCA": "CA",
-        "LMNI": "NI", 
-        "LMPB": "PB",
-        "LMSN": "SN",
-        "LMZN": "ZN",
-        "LMZS": "ZN"
-    }
-    
-    for code, symbol in symbol_map.items():
-        if bloomberg_symbol.startswith(code):
-            return symbol
-            
-    return bloomberg_symbol[:2].upper()
+    return _SYMBOL_BY_PREFIX.get(bloomberg_symbol[:4], bloomberg_symbol[:2].upper())
+
+def _get_search_index() -> List[Tuple[str, str, str, Ticker]]:
+    """Get the search index, rebuilding it if tickers have changed"""
+    global _SEARCH_INDEX, _INDEX_VERSION
+
+    version = ticker_service.get_version()
+    if version != _INDEX_VERSION:
+        tickers = sorted(ticker_service.get_all_tickers(), key=lambda t: t.symbol)
+        _SEARCH_INDEX = [
+            (
+                ticker.symbol.lower(),
+                ticker.description.lower(),
+                (ticker.product_category or "").lower(),
+                ticker,
+            )
+            for ticker in tickers
+        ]
+        _INDEX_VERSION = version
+
+    return _SEARCH_INDEX
 
 @router.get("/search", response_model=List[TickerSearchResult])
 async def search_tickers(
@@ -271,34 +338,33 @@ async def search_tickers(
     Returns simplified results suitable for dropdowns/autocomplete
     """
     try:
-        db_tickers = ticker_service.get_all_tickers()
-        
-        # Filter tickers based on search query
+        # Bucket matches by relevance in a single pass: exact symbol match,
+        # symbol starts with, description starts with, then contains.
+        # The index is ordered by symbol, so each bucket stays sorted.
         search_query = q.lower()
-        filtered_tickers = []
-        
-        for ticker in db_tickers:
-            # Search in symbol, description, and product_category
-            if (search_query in ticker.symbol.lower() or 
-                search_query in ticker.description.lower() or 
-                search_query in (ticker.product_category or "").lower()):
-                filtered_tickers.append(ticker)
-        
-        # Sort by relevance (exact symbol match first, then starts with, then contains)
-        def sort_key(ticker):
-            symbol_lower = ticker.symbol.lower()
-            desc_lower = ticker.description.lower()
-            
+        buckets: List[List[Ticker]] = [[], [], [], []]
+
+        search_index = await asyncio.to_thread(_get_search_index)
+
+        for symbol_lower, desc_lower, category_lower, ticker in search_index:
             if symbol_lower == search_query:
-                return (0, ticker.symbol)  # Exact match
+                bucket = buckets[0]
             elif symbol_lower.startswith(search_query):
-                return (1, ticker.symbol)  # Starts with
+                bucket = buckets[1]
             elif desc_lower.startswith(search_query):
-                return (2, ticker.symbol)  # Description starts with
+                bucket = buckets[2]
+            elif (search_query in symbol_lower or
+                  search_query in desc_lower or
+                  search_query in category_lower):
+                bucket = buckets[3]
             else:
-                return (3, ticker.symbol)  # Contains
-        
-        filtered_tickers.sort(key=sort_key)
+                continue
+
+            # No bucket ever needs more than `limit` entries
+            if len(bucket) < limit:
+                bucket.append(ticker)
+
+        filtered_tickers = [ticker for bucket in buckets for ticker in bucket]
         
         # Convert to search results and limit
         results = []
@@ -1,96 +1,191 @@
+import asyncio
 import logging
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional
+from typing import Dict, List, Literal, Optional, Sequence, Tuple, Union
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse
 
 from ..models.ticker import (
     HistoricalData,
+    HistoricalDataColumnar,
     HistoricalDataPoint,
     MarketStatus,
     TickerData,
 )
-from ..services.bloomberg_service import bloomberg_service
+from .http_cache import cached_json_response
+from ..services import bloomberg_batcher as batcher
+from ..services import quote_cache
+from ..services.bloomberg_service import get_bloomberg_service
+from ..services.market_hours import lme_state
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/prices", tags=["prices"])
 
 
 # Default metal symbols
-DEFAULT_METALS = [
+DEFAULT_METALS: Tuple[str, ...] = (
     "LMCADS03",  # LME Copper 3M
     "LMAHDS03",  # LME Aluminum 3M
     "LMZSDS03",  # LME Zinc 3M
     "LMPBDS03",  # LME Lead 3M
     "LMSNDS03",  # LME Tin 3M
     "LMNIDS03",  # LME Nickel 3M
-]
+)
 
-PRECIOUS_METALS = [
+PRECIOUS_METALS: Tuple[str, ...] = (
     "XAU=",  # Gold Spot
     "XAG=",  # Silver Spot
     "XPT=",  # Platinum Spot
     "XPD=",  # Palladium Spot
-]
+)
+
+ALL_METALS = DEFAULT_METALS + PRECIOUS_METALS
+
+# Static response for /prices/symbols, built once at import
+_AVAILABLE_SYMBOLS: Dict[str, List[Dict[str, str]]] = {
+    "base_metals": [
+        {"symbol": "LMCADS03", "description": "LME Copper 3M", "category": "CA"},
+        {"symbol": "LMAHDS03", "description": "LME Aluminum 3M", "category": "AH"},
+        {"symbol": "LMZSDS03", "description": "LME Zinc 3M", "category": "ZN"},
+        {"symbol": "LMPBDS03", "description": "LME Lead 3M", "category": "PB"},
+        {"symbol": "LMSNDS03", "description": "LME Tin 3M", "category": "SN"},
+        {"symbol": "LMNIDS03", "description": "LME Nickel 3M", "category": "NI"},
+    ],
+    "precious_metals": [
+        {"symbol": "XAU=", "description": "Gold Spot", "category": "PM"},
+        {"symbol": "XAG=", "description": "Silver Spot", "category": "PM"},
+        {"symbol": "XPT=", "description": "Platinum Spot", "category": "PM"},
+        {"symbol": "XPD=", "description": "Palladium Spot", "category": "PM"},
+    ],
+}
 
 
 @router.get("/latest", response_model=List[TickerData])
 async def get_latest_prices(
+    request: Request,
     symbols: Optional[str] = Query(None, description="Comma-separated list of symbols"),
     include_precious: bool = Query(False, description="Include precious metals"),
-) -> List[TickerData]:
+) -> Response:
     """Get latest prices for metals"""
     try:
         # Parse symbols or use defaults
+        symbol_list: Sequence[str]
         if symbols:
-            symbol_list = [s.strip() for s in symbols.split(",")]
+            # Drop blanks and duplicates, keeping the caller's order
+            symbol_list = list(dict.fromkeys(s for s in map(str.strip, symbols.split(",")) if s))
         else:
-            symbol_list = DEFAULT_METALS.copy()
-            if include_precious:
-                symbol_list.extend(PRECIOUS_METALS)
-
-        # Get real-time data
-        raw_data = bloomberg_service.get_real_time_data(symbol_list)
-
-        # Convert to response model
-        results = []
-        for item in raw_data:
-            ticker = TickerData(
+            symbol_list = ALL_METALS if include_precious else DEFAULT_METALS
+
+        # Serve fresh quotes from cache, fetch the rest (coalesced with
+        # other in-flight requests)
+        quotes, misses = quote_cache.get_many(symbol_list)
+        if misses:
+            fetched = await batcher.get_quotes(misses)
+            quote_cache.set_many(time.monotonic(), fetched)
+            quotes.update(fetched)
+
+        # Convert to response model (trusted Bloomberg data, skip validation)
+        now = datetime.now(timezone.utc)
+        results = [
+            TickerData.model_construct(
                 symbol=item["symbol"],
                 description=item.get("description", ""),
                 product_category=item.get("product_category", ""),
                 px_last=item.get("px_last", 0),
                 change=item.get("change"),
                 change_pct=item.get("change_pct"),
-                timestamp=datetime.now(timezone.utc),
+                timestamp=now,
             )
-            results.append(ticker)
+            # Cache hits and fetched misses arrive separately; answer in request order
+            for symbol in symbol_list
+            if (item := quotes.get(symbol)) is not None
+        ]
 
-        return results
+        # Rows are stamped with the serving time, which must not change the ETag
+        return cached_json_response(request, results, etag_exclude=("timestamp",))
 
     except Exception as e:
         logger.error(f"Error fetching latest prices: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/historical/{symbol}", response_model=HistoricalData)
+@router.get("/historical", response_model=List[HistoricalData])
+async def get_historical_prices_bulk(
+    symbols: str = Query(..., description="Comma-separated list of symbols"),
+    days: int = Query(
+        30, ge=1, le=365, description="Number of days of historical data"
+    ),
+) -> List[HistoricalData]:
+    """Get historical prices for several metals in one request"""
+    try:
+        end_date = datetime.now(timezone.utc)
+        start_date = end_date - timedelta(days=days)
+        symbol_list = list(dict.fromkeys(s for s in map(str.strip, symbols.split(",")) if s))
+
+        # Cache lookup and Bloomberg requests are batched across all symbols
+        raw_data = await asyncio.to_thread(
+            get_bloomberg_service().get_historical_data_bulk,
+            symbol_list,
+            start_date,
+            end_date,
+        )
+
+        return [
+            HistoricalData(
+                symbol=symbol,
+                data_points=[
+                    HistoricalDataPoint.model_construct(date=item["date"], price=item["price"])
+                    for item in raw_data.get(symbol, [])
+                ],
+                start_date=start_date.strftime("%Y-%m-%d"),
+                end_date=end_date.strftime("%Y-%m-%d"),
+            )
+            for symbol in symbol_list
+        ]
+
+    except Exception as e:
+        logger.error(f"Error fetching historical prices for {symbols}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get(
+    "/historical/{symbol}",
+    response_model=Union[HistoricalData, HistoricalDataColumnar],
+)
 async def get_historical_prices(
     symbol: str,
     days: int = Query(
         30, ge=1, le=365, description="Number of days of historical data"
     ),
-) -> HistoricalData:
+    format: Literal["rows", "columns"] = Query(
+        "rows", description="'rows' for data_points objects, 'columns' for date/price arrays"
+    ),
+) -> Union[HistoricalData, Response]:
     """Get historical prices for a specific metal"""
     try:
         end_date = datetime.now(timezone.utc)
         start_date = end_date - timedelta(days=days)
 
         # Get historical data
-        raw_data = bloomberg_service.get_historical_data(symbol, start_date, end_date)
+        raw_data = await asyncio.to_thread(
+            get_bloomberg_service().get_historical_data, symbol, start_date, end_date
+        )
 
-        # Convert to response model
+        if format == "columns":
+            # No per-point objects; serialized straight to JSON arrays
+            return ORJSONResponse({
+                "symbol": symbol,
+                "dates": [item["date"] for item in raw_data],
+                "prices": [item["price"] for item in raw_data],
+                "start_date": start_date.strftime("%Y-%m-%d"),
+                "end_date": end_date.strftime("%Y-%m-%d"),
+            })
+
+        # Convert to response model (trusted Bloomberg data, skip validation)
         data_points = [
-            HistoricalDataPoint(date=item["date"], price=item["price"])
+            HistoricalDataPoint.model_construct(date=item["date"], price=item["price"])
             for item in raw_data
         ]
 
@@ -107,66 +202,19 @@ async def get_historical_prices(
 
 
 @router.get("/market-status", response_model=MarketStatus)
-async def get_market_status() -> MarketStatus:
+async def get_market_status(request: Request) -> Response:
     """Get current market status"""
-    now = datetime.now(timezone.utc)
-
-    # Simple market hours check (London Metal Exchange hours)
-    # LME is open Mon-Fri 01:00-19:00 UTC
-    is_weekend = now.weekday() >= 5
-    hour = now.hour
-
-    if is_weekend:
-        is_open = False
-        message = "Market closed - Weekend"
-        # Calculate next Monday 01:00 UTC
-        days_until_monday = (7 - now.weekday()) % 7
-        if days_until_monday == 0:
-            days_until_monday = 7
-        next_open = now.replace(hour=1, minute=0, second=0, microsecond=0) + timedelta(
-            days=days_until_monday
-        )
-    elif hour < 1:
-        is_open = False
-        message = "Market closed - Pre-market"
-        next_open = now.replace(hour=1, minute=0, second=0, microsecond=0)
-    elif hour >= 19:
-        is_open = False
-        message = "Market closed - After hours"
-        # Next day 01:00 UTC
-        next_open = (now + timedelta(days=1)).replace(
-            hour=1, minute=0, second=0, microsecond=0
-        )
-    else:
-        is_open = True
-        message = "Market open"
-        next_close = now.replace(hour=19, minute=0, second=0, microsecond=0)
-
-        return MarketStatus(
-            is_open=is_open, message=message, next_open=None, next_close=next_close
-        )
+    state = lme_state(datetime.now(timezone.utc))
 
-    return MarketStatus(
-        is_open=is_open, message=message, next_open=next_open, next_close=None
-    )
+    return cached_json_response(request, MarketStatus(
+        is_open=state.is_open,
+        message=state.message,
+        next_open=state.next_open,
+        next_close=state.next_close,
+    ))
 
 
 @router.get("/symbols")
 async def get_available_symbols() -> Dict[str, List[Dict[str, str]]]:
     """Get list of available metal symbols"""
-    return {
-        "base_metals": [
-            {"symbol": "LMCADS03", "description": "LME Copper 3M", "category": "CA"},
-            {"symbol": "LMAHDS03", "description": "LME Aluminum 3M", "category": "AH"},
-            {"symbol": "LMZSDS03", "description": "LME Zinc 3M", "category": "ZN"},
-            {"symbol": "LMPBDS03", "description": "LME Lead 3M", "category": "PB"},
-            {"symbol": "LMSNDS03", "description": "LME Tin 3M", "category": "SN"},
-            {"symbol": "LMNIDS03", "description": "LME Nickel 3M", "category": "NI"},
-        ],
-        "precious_metals": [
-            {"symbol": "XAU=", "description": "Gold Spot", "category": "PM"},
-            {"symbol": "XAG=", "description": "Silver Spot", "category": "PM"},
-            {"symbol": "XPT=", "description": "Platinum Spot", "category": "PM"},
-            {"symbol": "XPD=", "description": "Palladium Spot", "category": "PM"},
-        ],
-    }
+    return _AVAILABLE_SYMBOLS
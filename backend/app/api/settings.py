@@ -1,8 +1,10 @@
+import asyncio
 import logging
 
 from fastapi import APIRouter, HTTPException
 
-from ..services.bloomberg_service import bloomberg_service
+from ..services import status_cache
+from ..services.bloomberg_service import get_bloomberg_service
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/settings", tags=["settings"])
@@ -12,7 +14,7 @@ router = APIRouter(prefix="/settings", tags=["settings"])
 async def get_bloomberg_status() -> dict:
     """Get current Bloomberg connection status"""
     try:
-        status = bloomberg_service.get_connection_status()
+        status = status_cache.get_cached_status()
         return {
             "bloomberg_available": status["bloomberg_available"],
             "is_connected": status["is_connected"],
@@ -29,7 +31,7 @@ async def get_bloomberg_status() -> dict:
 async def get_data_source_status() -> dict:
     """Get current data source status and information"""
     try:
-        status = bloomberg_service.get_connection_status()
+        status = status_cache.get_cached_status()
         
         if status["is_connected"]:
             data_status = "connected"
@@ -57,9 +59,12 @@ async def get_data_source_status() -> dict:
 async def reconnect_bloomberg() -> dict:
     """Attempt to reconnect to Bloomberg Terminal"""
     try:
-        # Reinitialize Bloomberg connection
-        bloomberg_service._initialize_bloomberg()
-        status = bloomberg_service.get_connection_status()
+        # Swap in a fresh Bloomberg session
+        try:
+            await asyncio.to_thread(get_bloomberg_service().reconnect)
+        finally:
+            status_cache.invalidate()
+        status = status_cache.get_cached_status()
         
         return {
             "success": status["is_connected"],
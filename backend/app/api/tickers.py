@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional
@@ -17,10 +18,17 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/tickers", tags=["tickers"])
 
+# Static response for /tickers/categories/, built once at import
+_CATEGORY_VALUES: List[str] = [category.value for category in ProductCategory]
+
+
+# Shared service instance; DB access is per-thread so it is safe across requests
+_ticker_service = TickerService()
+
 
 def get_ticker_service() -> TickerService:
     """Dependency to get ticker service"""
-    return TickerService()
+    return _ticker_service
 
 
 @router.get("/", response_model=List[Ticker])
@@ -32,7 +40,7 @@ async def get_tickers(
 ) -> List[Ticker]:
     """Get all tickers, optionally filtered by product category"""
     try:
-        return ticker_service.get_all_tickers(product_category)
+        return await asyncio.to_thread(ticker_service.get_all_tickers, product_category)
     except Exception as e:
         logger.error(f"Error getting tickers: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -45,7 +53,7 @@ async def search_tickers(
 ) -> List[Ticker]:
     """Search tickers by symbol or description"""
     try:
-        return ticker_service.search_tickers(q)
+        return await asyncio.to_thread(ticker_service.search_tickers, q)
     except Exception as e:
         logger.error(f"Error searching tickers: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -60,7 +68,9 @@ async def get_latest_prices(
 ) -> List[Dict[str, Any]]:
     """Get latest prices for all tickers"""
     try:
-        return ticker_service.get_latest_prices(product_category)
+        return await asyncio.to_thread(
+            ticker_service.get_latest_prices, product_category
+        )
     except Exception as e:
         logger.error(f"Error getting latest prices: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -72,7 +82,7 @@ async def get_ticker(
 ) -> Ticker:
     """Get ticker by ID"""
     try:
-        ticker = ticker_service.get_ticker_by_id(ticker_id)
+        ticker = await asyncio.to_thread(ticker_service.get_ticker_by_id, ticker_id)
         if not ticker:
             raise HTTPException(status_code=404, detail="Ticker not found")
         return ticker
@@ -90,7 +100,7 @@ async def create_ticker(
 ) -> Ticker:
     """Create a new ticker"""
     try:
-        return ticker_service.create_ticker(ticker_data)
+        return await asyncio.to_thread(ticker_service.create_ticker, ticker_data)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -106,7 +116,9 @@ async def update_ticker(
 ) -> Ticker:
     """Update an existing ticker"""
     try:
-        ticker = ticker_service.update_ticker(ticker_id, ticker_data)
+        ticker = await asyncio.to_thread(
+            ticker_service.update_ticker, ticker_id, ticker_data
+        )
         if not ticker:
             raise HTTPException(status_code=404, detail="Ticker not found")
         return ticker
@@ -123,7 +135,7 @@ async def delete_ticker(
 ) -> None:
     """Delete a ticker"""
     try:
-        success = ticker_service.delete_ticker(ticker_id)
+        success = await asyncio.to_thread(ticker_service.delete_ticker, ticker_id)
         if not success:
             raise HTTPException(status_code=404, detail="Ticker not found")
     except HTTPException:
@@ -147,8 +159,8 @@ async def get_ticker_prices(
 ) -> PriceDataResponse:
     """Get price data for a ticker"""
     try:
-        price_data = ticker_service.get_price_data(
-            ticker_id, start_date, end_date, limit
+        price_data = await asyncio.to_thread(
+            ticker_service.get_price_data, ticker_id, start_date, end_date, limit
         )
         if not price_data:
             raise HTTPException(status_code=404, detail="Ticker not found")
@@ -163,4 +175,4 @@ async def get_ticker_prices(
 @router.get("/categories/", response_model=List[str])
 async def get_product_categories() -> List[str]:
     """Get all available product categories"""
-    return [category.value for category in ProductCategory]
+    return _CATEGORY_VALUES
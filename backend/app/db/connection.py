@@ -1,11 +1,38 @@
 import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import duckdb
 
+__all__ = [
+    "DatabaseConnection",
+    "db",
+    "get_db",
+    "init_database",
+    "health_check",
+    "cleanup_old_data",
+]
+
 logger = logging.getLogger(__name__)
 
+# Worker threads DuckDB may use for a single query
+DUCKDB_THREADS = int(os.getenv("DUCKDB_THREADS", str(os.cpu_count() or 1)))
+
+# Settings applied when the shared connection is opened
+DUCKDB_CONFIG: Dict[str, Any] = {
+    "threads": DUCKDB_THREADS,
+    "memory_limit": os.getenv("DUCKDB_MEMORY_LIMIT", "2GB"),
+    # Every query that needs an order says so, letting scans run in parallel
+    "preserve_insertion_order": False,
+    # Checkpoint less often so bursts of quote inserts stay in the WAL
+    "checkpoint_threshold": os.getenv("DUCKDB_CHECKPOINT_THRESHOLD", "1GB"),
+}
+
 
 class DatabaseConnection:
     """DuckDB database connection manager"""
@@ -13,6 +40,11 @@ class DatabaseConnection:
     def __init__(self, db_path: str = "./data/metals.db") -> None:
         self.db_path = db_path
         self._connection: Optional[duckdb.DuckDBPyConnection] = None
+        self._connect_lock = threading.Lock()
+        # DuckDB connections are not thread-safe, so each thread gets a cursor
+        self._local = threading.local()
+        # Serializes bulk writers so they don't hit transaction conflicts
+        self._write_lock = threading.Lock()
         self._ensure_data_directory()
 
     def _ensure_data_directory(self) -> None:
@@ -21,18 +53,46 @@ class DatabaseConnection:
         data_dir.mkdir(parents=True, exist_ok=True)
 
     def get_connection(self) -> duckdb.DuckDBPyConnection:
-        """Get or create database connection"""
-        if self._connection is None:
-            self._connection = duckdb.connect(self.db_path)
-            logger.info(f"Connected to DuckDB at {self.db_path}")
-        return self._connection
+        """Get this thread's cursor on the shared database connection"""
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            with self._connect_lock:
+                if self._connection is None:
+                    self._connection = duckdb.connect(
+                        self.db_path, config=DUCKDB_CONFIG
+                    )
+                    logger.info("Connected to DuckDB at %s", self.db_path)
+                cursor = self._connection.cursor()
+            self._local.cursor = cursor
+        return cursor
+
+    @contextmanager
+    def writer(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """Get this thread's cursor with exclusive write access"""
+        with self._write_lock:
+            yield self.get_connection()
+
+    @contextmanager
+    def transaction(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """Run a block of writes as one exclusive, all-or-nothing transaction"""
+        with self.writer() as conn:
+            conn.begin()
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
 
     def close(self) -> None:
         """Close database connection"""
-        if self._connection:
-            self._connection.close()
-            self._connection = None
-            logger.info("Database connection closed")
+        with self._connect_lock:
+            if self._connection:
+                self._connection.close()
+                self._connection = None
+                # Drop every thread's cursor along with the connection
+                self._local = threading.local()
+                logger.info("Database connection closed")
 
     def execute(self, query: str, parameters: Optional[List[Any]] = None) -> Any:
         """Execute a query"""
@@ -51,6 +111,13 @@ class DatabaseConnection:
         result = self.execute(query, parameters)
         return result.fetchone()
 
+    def fetchnumpy(
+        self, query: str, parameters: Optional[List[Any]] = None
+    ) -> Dict[str, Any]:
+        """Execute query and fetch results as NumPy arrays keyed by column"""
+        columns: Dict[str, Any] = self.execute(query, parameters).fetchnumpy()
+        return columns
+
 
 # Global database instance
 db = DatabaseConnection()
@@ -61,6 +128,18 @@ def get_db() -> DatabaseConnection:
     return db
 
 
+def _ensure_id_sequence(
+    conn: duckdb.DuckDBPyConnection, table: str, sequence: str
+) -> None:
+    """Default table.id to a sequence that starts after any existing rows"""
+    row = conn.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}").fetchone()
+    next_id = row[0] if row else 1
+    conn.execute(f"CREATE SEQUENCE IF NOT EXISTS {sequence} START {next_id}")
+    conn.execute(
+        f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{sequence}')"
+    )
+
+
 def init_database() -> None:
     """Initialize database with required tables"""
     conn = db.get_connection()
@@ -93,6 +172,8 @@ def init_database() -> None:
             px_high DOUBLE,
             px_low DOUBLE,
             px_volume DOUBLE,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            is_intraday BOOLEAN DEFAULT FALSE,
             UNIQUE(ticker_id, date)
         )
     """
@@ -126,9 +207,82 @@ def init_database() -> None:
     """
     )
 
+    # Let DuckDB assign row ids instead of computing MAX(id) + 1 per insert
+    _ensure_id_sequence(conn, "tickers", "tickers_id_seq")
+    _ensure_id_sequence(conn, "price_data", "price_data_id_seq")
+    _ensure_id_sequence(conn, "custom_instruments", "custom_instruments_id_seq")
+    _ensure_id_sequence(conn, "settlement_prices", "settlement_prices_id_seq")
+
+    # Databases created before cached prices carried a write time: their rows
+    # keep a NULL updated_at, which the history TTL treats as expired
+    conn.execute("ALTER TABLE price_data ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP")
+    conn.execute(
+        "ALTER TABLE price_data ALTER COLUMN updated_at SET DEFAULT CURRENT_TIMESTAMP"
+    )
+
+    # Older databases mixed live quotes into the daily history; quotes were
+    # stored with their time of day, daily bars at midnight
+    conn.execute("ALTER TABLE price_data ADD COLUMN IF NOT EXISTS is_intraday BOOLEAN")
+    conn.execute(
+        "UPDATE price_data SET is_intraday = date <> date_trunc('day', date) "
+        "WHERE is_intraday IS NULL"
+    )
+    conn.execute("ALTER TABLE price_data ALTER COLUMN is_intraday SET DEFAULT FALSE")
+
     logger.info("Database tables initialized successfully")
 
 
+# Tables that must exist for the app to work
+REQUIRED_TABLES = ("tickers", "price_data", "custom_instruments", "settlement_prices")
+
+# How long health-check row counts are reused (seconds)
+HEALTH_COUNT_TTL = 5.0
+
+# Table names, cached once every required table exists (tables are never dropped)
+_schema_tables: Optional[List[str]] = None
+# (monotonic time, ticker count, price count)
+_count_cache: Tuple[float, int, int] = (0.0, 0, 0)
+
+
+def _get_table_names(conn: duckdb.DuckDBPyConnection) -> List[str]:
+    """Get table names, querying information_schema until the schema is complete"""
+    global _schema_tables
+
+    if _schema_tables is not None:
+        return _schema_tables
+
+    tables = conn.execute(
+        """
+        SELECT table_name
+        FROM information_schema.tables
+        WHERE table_schema = 'main'
+    """
+    ).fetchall()
+
+    table_names = [table[0] for table in tables]
+    if all(table in table_names for table in REQUIRED_TABLES):
+        _schema_tables = table_names
+    return table_names
+
+
+def _get_row_counts(conn: duckdb.DuckDBPyConnection) -> Tuple[int, int]:
+    """Get (ticker count, price count), rescanning at most once per HEALTH_COUNT_TTL"""
+    global _count_cache
+
+    checked_at, ticker_count, price_count = _count_cache
+    if checked_at and time.monotonic() - checked_at < HEALTH_COUNT_TTL:
+        return ticker_count, price_count
+
+    ticker_result = conn.execute("SELECT COUNT(*) FROM tickers").fetchone()
+    price_result = conn.execute("SELECT COUNT(*) FROM price_data").fetchone()
+
+    ticker_count = ticker_result[0] if ticker_result else 0
+    price_count = price_result[0] if price_result else 0
+
+    _count_cache = (time.monotonic(), ticker_count, price_count)
+    return ticker_count, price_count
+
+
 def health_check() -> dict:
     """Perform database health check"""
     try:
@@ -140,23 +294,9 @@ def health_check() -> dict:
             return {"status": "error", "message": "Basic query failed"}
 
         # Check if tables exist
-        tables = conn.execute(
-            """
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = 'main'
-        """
-        ).fetchall()
-
-        table_names = [table[0] for table in tables]
-        required_tables = [
-            "tickers",
-            "price_data",
-            "custom_instruments",
-            "settlement_prices",
-        ]
+        table_names = _get_table_names(conn)
         missing_tables = [
-            table for table in required_tables if table not in table_names
+            table for table in REQUIRED_TABLES if table not in table_names
         ]
 
         if missing_tables:
@@ -166,11 +306,7 @@ def health_check() -> dict:
             }
 
         # Check data counts
-        ticker_result = conn.execute("SELECT COUNT(*) FROM tickers").fetchone()
-        price_result = conn.execute("SELECT COUNT(*) FROM price_data").fetchone()
-
-        ticker_count = ticker_result[0] if ticker_result else 0
-        price_count = price_result[0] if price_result else 0
+        ticker_count, price_count = _get_row_counts(conn)
 
         return {
             "status": "healthy",
@@ -189,21 +325,22 @@ def health_check() -> dict:
 def cleanup_old_data(days: int = 90) -> int:
     """Clean up old price data beyond specified days"""
     try:
-        conn = db.get_connection()
+        # Bind a literal cutoff (UTC midnight) so DuckDB can prune row groups
+        # using the date column's min/max zonemaps
+        cutoff = datetime.now(timezone.utc).replace(
+            tzinfo=None, hour=0, minute=0, second=0, microsecond=0
+        ) - timedelta(days=days)
 
-        result = conn.execute(
-            """
-            DELETE FROM price_data
-            WHERE date < (CURRENT_DATE - INTERVAL ? DAYS)
-        """,
-            [days],
-        )
+        with db.writer() as conn:
+            result = conn.execute(
+                "DELETE FROM price_data WHERE date < ?", [cutoff]
+            ).fetchone()
 
-        rows_deleted = result.rowcount if hasattr(result, "rowcount") else 0
-        logger.info(f"Cleaned up {rows_deleted} old price records")
+        rows_deleted = int(result[0]) if result else 0
+        logger.info("Cleaned up %d old price records", rows_deleted)
 
         return rows_deleted
 
     except Exception as e:
-        logger.error(f"Error cleaning up old data: {e}")
+        logger.error("Error cleaning up old data: %s", e)
         return 0
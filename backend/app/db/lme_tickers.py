@@ -3,7 +3,8 @@ LME (London Metal Exchange) Ticker Definitions
 Structured data for Bloomberg ticker codes as requested by user
 """
 
-from typing import Dict, List
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Tuple
 from datetime import datetime
 
 # LME Ticker definitions in the exact format requested
@@ -58,31 +59,38 @@ LME_TICKERS = [
     }
 ]
 
+# Read-only views derived once from LME_TICKERS (it never changes at runtime)
+_BY_SYMBOL: Dict[str, Mapping[str, str]] = {
+    ticker["bloomberg_symbol"]: MappingProxyType(ticker) for ticker in LME_TICKERS
+}
+_BLOOMBERG_SYMBOLS: Tuple[str, ...] = tuple(_BY_SYMBOL)
+_DB_ROWS: Tuple[Mapping[str, Any], ...] = tuple(
+    MappingProxyType({
+        "symbol": ticker["bloomberg_symbol"],
+        "description": ticker["description"],
+        "product_category": ticker["symbol"],  # Using the short symbol as category
+        "full_ticker": ticker["ticker"],
+        "metal": ticker["metal"],
+        "is_custom": False
+    })
+    for ticker in LME_TICKERS
+)
+
 def get_lme_tickers() -> List[Dict]:
     """Get the list of LME tickers"""
     return LME_TICKERS
 
-def get_bloomberg_symbols() -> List[str]:
+def get_bloomberg_symbols() -> Tuple[str, ...]:
     """Get just the Bloomberg symbols for API calls"""
-    return [ticker["bloomberg_symbol"] for ticker in LME_TICKERS]
+    return _BLOOMBERG_SYMBOLS
 
-def get_ticker_by_symbol(symbol: str) -> Dict:
+def get_ticker_by_symbol(symbol: str) -> Mapping[str, str]:
     """Get ticker data by Bloomberg symbol"""
-    for ticker in LME_TICKERS:
-        if ticker["bloomberg_symbol"] == symbol:
-            return ticker
-    raise ValueError(f"Ticker not found: {symbol}")
+    try:
+        return _BY_SYMBOL[symbol]
+    except KeyError:
+        raise ValueError(f"Ticker not found: {symbol}") from None
 
-def format_for_database() -> List[Dict]:
+def format_for_database() -> Tuple[Mapping[str, Any], ...]:
     """Format tickers for database insertion"""
-    return [
-        {
-            "symbol": ticker["bloomberg_symbol"],
-            "description": ticker["description"],
-            "product_category": ticker["symbol"],  # Using the short symbol as category
-            "full_ticker": ticker["ticker"],
-            "metal": ticker["metal"],
-            "is_custom": False
-        }
-        for ticker in LME_TICKERS
-    ] 
\ No newline at end of file
+    return _DB_ROWS
@@ -1,36 +1,49 @@
+import asyncio
 import logging
 import os
-from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, suppress
 from typing import Any, AsyncGenerator, Dict
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 # Import routers
 from .api.health import router as health_router
 from .api.prices import router as prices_router
 from .api.settings import router as settings_router
 from .api.lme import router as lme_router
+from .db.connection import init_database
+from .services import price_refresher
+from .services.bloomberg_service import close_bloomberg_service, get_bloomberg_service
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Worker threads for blocking Bloomberg / DuckDB calls made via asyncio.to_thread
+THREADPOOL_WORKERS = 32
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan"""
     # Startup
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=THREADPOOL_WORKERS)
+    )
+
     try:
         # Initialize database
-        from .db.connection import init_database
-
         init_database()
 
         # Initialize Bloomberg service
-        from .services.bloomberg_service import bloomberg_service
-        status = bloomberg_service.get_connection_status()
+        status = get_bloomberg_service().get_connection_status()
         logger.info(f"Application starting - Bloomberg Status: {status['status']}")
+
+        # Keep live prices warm in the background
+        refresh_task = price_refresher.start()
         logger.info("Application startup completed successfully")
     except Exception as e:
         logger.error(f"Startup failed: {e}")
@@ -39,10 +52,13 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     yield
 
     # Shutdown
-    try:
-        from .services.bloomberg_service import bloomberg_service
+    if refresh_task is not None:
+        refresh_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await refresh_task
 
-        bloomberg_service.close()
+    try:
+        close_bloomberg_service()
         logger.info("Application shutdown completed")
     except Exception as e:
         logger.error(f"Shutdown error: {e}")
@@ -53,6 +69,7 @@ app = FastAPI(
     description="API for metals trading dashboard with Bloomberg integration",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
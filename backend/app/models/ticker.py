@@ -1,8 +1,8 @@
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_serializer
 
 
 class ProductCategory(str, Enum):
@@ -17,6 +17,10 @@ class ProductCategory(str, Enum):
     ALL = "ALL"  # All metals
 
 
+# ProductCategory values as a Literal; validated as a plain set lookup
+ProductCategoryCode = Literal["AH", "CA", "ZN", "PB", "NI", "SN", "ALL"]
+
+
 class TickerBase(BaseModel):
     """Base ticker model"""
 
@@ -51,8 +55,7 @@ class Ticker(TickerBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class PriceData(BaseModel):
@@ -67,8 +70,7 @@ class PriceData(BaseModel):
     px_low: Optional[float] = Field(None, description="Low price")
     px_volume: Optional[float] = Field(None, description="Volume")
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class PriceDataResponse(BaseModel):
@@ -89,8 +91,7 @@ class CustomInstrument(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class CustomInstrumentCreate(BaseModel):
@@ -108,10 +109,9 @@ class SettlementPrice(BaseModel):
     symbol: str
     date: datetime
     settlement_price: float
-    product_category: ProductCategory
+    product_category: ProductCategoryCode
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class TickerData(BaseModel):
@@ -125,8 +125,10 @@ class TickerData(BaseModel):
     change_pct: Optional[float] = None
     timestamp: Optional[datetime] = None
 
-    class Config:
-        json_encoders = {datetime: lambda v: v.isoformat() if v else None}
+    @field_serializer("timestamp", when_used="json")
+    def serialize_timestamp(self, value: Optional[datetime]) -> Optional[str]:
+        """Serialize timestamps as ISO 8601"""
+        return value.isoformat() if value else None
 
 
 class HistoricalDataPoint(BaseModel):
@@ -145,6 +147,16 @@ class HistoricalData(BaseModel):
     end_date: str
 
 
+class HistoricalDataColumnar(BaseModel):
+    """Historical data response with parallel date/price columns"""
+
+    symbol: str
+    dates: List[str]
+    prices: List[float]
+    start_date: str
+    end_date: str
+
+
 class MarketStatus(BaseModel):
     """Market status information"""
 
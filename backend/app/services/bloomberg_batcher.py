@@ -0,0 +1,103 @@
+"""
+Bloomberg request coalescer
+Merges concurrent quote requests into a single Bloomberg call per window
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, Optional, Set
+
+from .bloomberg_service import get_bloomberg_service
+
+logger = logging.getLogger(__name__)
+
+# Debounce window used to collect symbols before calling Bloomberg (seconds)
+COALESCE_WINDOW = 0.02
+
+Quote = Optional[Dict[str, Any]]
+
+
+class QuoteBatcher:
+    """Coalesces overlapping real-time quote requests into one Bloomberg fetch"""
+
+    def __init__(self) -> None:
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Futures for every symbol that is queued or currently being fetched
+        self._pending: Dict[str, "asyncio.Future[Quote]"] = {}
+        # Symbols waiting for the next flush
+        self._queued: Set[str] = set()
+        self._worker: Optional["asyncio.Task[None]"] = None
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        """Reset state if we are running on a different event loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._pending = {}
+            self._queued = set()
+            self._worker = None
+        return loop
+
+    async def get_quotes(self, symbols: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Get real-time quotes keyed by symbol, sharing in-flight fetches"""
+        loop = self._bind_loop()
+
+        futures: Dict[str, "asyncio.Future[Quote]"] = {}
+        for symbol in symbols:
+            future = self._pending.get(symbol)
+            if future is None:
+                future = loop.create_future()
+                self._pending[symbol] = future
+                self._queued.add(symbol)
+            futures[symbol] = future
+
+        if not futures:
+            return {}
+
+        if self._queued and self._worker is None:
+            self._worker = loop.create_task(self._flush())
+
+        # Shield shared futures so one cancelled caller doesn't cancel the others
+        quotes = await asyncio.gather(*(asyncio.shield(f) for f in futures.values()))
+
+        return {
+            symbol: quote
+            for symbol, quote in zip(futures, quotes)
+            if quote is not None
+        }
+
+    async def _flush(self) -> None:
+        """Wait for the debounce window, then fetch every queued symbol at once"""
+        await asyncio.sleep(COALESCE_WINDOW)
+
+        batch = {symbol: self._pending[symbol] for symbol in self._queued}
+        self._queued = set()
+        self._worker = None
+
+        try:
+            logger.debug(f"Fetching {len(batch)} coalesced symbols from Bloomberg")
+            data = await asyncio.to_thread(
+                get_bloomberg_service().get_real_time_data, list(batch)
+            )
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            by_symbol = {item["symbol"]: item for item in data}
+            for symbol, future in batch.items():
+                if not future.done():
+                    future.set_result(by_symbol.get(symbol))
+        finally:
+            for symbol, future in batch.items():
+                if self._pending.get(symbol) is future:
+                    del self._pending[symbol]
+
+
+# Per-process instance
+_batcher = QuoteBatcher()
+
+
+async def get_quotes(symbols: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """Get real-time quotes for symbols via the shared coalescer"""
+    return await _batcher.get_quotes(symbols)
@@ -1,10 +1,30 @@
 # mypy: disable-error-code=unreachable
+import itertools
 import logging
 import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timezone, timedelta
-from typing import Any, Dict, List, Optional
+from functools import cached_property
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 from decimal import Decimal
 
+import numpy as np
+import pandas as pd
+
+from .ticker_service import TickerService
+
+__all__ = [
+    "BLOOMBERG_AVAILABLE",
+    "BLOOMBERG_TYPE",
+    "BloombergService",
+    "close_bloomberg_service",
+    "get_bloomberg_service",
+]
+
 logger = logging.getLogger(__name__)
 
 # Bloomberg API imports - try both blpapi and xbbg
@@ -33,14 +53,73 @@ except ImportError:
         logger.warning("Neither blpapi nor xbbg available - Bloomberg API not available")
         BLOOMBERG_AVAILABLE = False
 
+# Maximum number of concurrent blpapi sessions
+BLOOMBERG_POOL_SIZE = int(os.getenv("BLOOMBERG_POOL_SIZE", "4"))
+
+# Seconds to wait for a pooled session when all of them are busy
+SESSION_WAIT_TIMEOUT = 30.0
+
+# Waiters re-check the pool this often, so they follow it across a reconnect
+SESSION_POLL_INTERVAL = 0.5
+
+# Seconds between reconnect attempts while Bloomberg is down, doubling per failure
+RECONNECT_BACKOFF_MIN = 1.0
+RECONNECT_BACKOFF_MAX = 60.0
+
+# Seconds before cached history is refetched from Bloomberg
+HISTORY_CACHE_TTL = float(os.getenv("HISTORY_CACHE_TTL", str(24 * 60 * 60)))
+
+# Maximum securities per Bloomberg HistoricalDataRequest
+HISTORICAL_BATCH_SIZE = 100
+
+# Unique per request, so a reply that outlives its request's timeout is never
+# mistaken for the answer to the next request on the same pooled session
+_correlation_ids = itertools.count(1)
+
+# ReferenceDataRequest field -> (result key, blpapi getter, default when missing)
+REFERENCE_FIELDS = {
+    "PX_LAST": ("px_last", "getValueAsFloat", 0.0),
+    "NAME": ("description", "getValueAsString", ""),
+    "GICS_SECTOR_NAME": ("product_category", "getValueAsString", "Unknown"),
+}
+
+
+def _extract_reference_fields(field_data: Any) -> Dict[str, Any]:
+    """Read the requested reference fields in one pass over fieldData"""
+    values = {key: default for key, _, default in REFERENCE_FIELDS.values()}
+    for element in field_data.elements():
+        spec = REFERENCE_FIELDS.get(str(element.name()))
+        if spec is not None and not element.isNull():
+            values[spec[0]] = getattr(element, spec[1])()
+    return values
+
 
 class BloombergService:
     """Service for fetching real-time and historical data from Bloomberg API"""
 
     def __init__(self) -> None:
-        self._session = None
         self._is_connected = False
         self._startup_error = None
+        # (is_connected, startup_error) -> status dict, rebuilt when either changes
+        self._status_cache: Optional[Tuple[Tuple[bool, Optional[str]], Dict[str, Any]]] = None
+        # blpapi sessions, started on demand up to BLOOMBERG_POOL_SIZE
+        self._sessions: List[Any] = []
+        self._idle: "queue.Queue[Any]" = queue.Queue()
+        self._pool_lock = threading.Lock()
+        # xbbg shares one global connection, so its requests run one at a time
+        self._request_lock = threading.RLock()
+        # Only one caller reconnects at a time, and not more often than the backoff
+        self._reconnect_lock = threading.Lock()
+        self._last_reconnect = 0.0
+        self._reconnect_backoff = RECONNECT_BACKOFF_MIN
+        # DuckDB cache writes run here, in order, off the request path
+        self._cache_writer = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="bloomberg-cache"
+        )
+        # Real-time quotes queued while a write is in flight go out as one batch
+        self._pending_quotes: List[Dict[str, Any]] = []
+        self._pending_lock = threading.Lock()
+        self._drain_scheduled = False
         
         if BLOOMBERG_AVAILABLE:
             try:
@@ -71,17 +150,35 @@ class BloombergService:
             logger.error(f"xbbg connection test failed: {e}")
             return False
 
-    @property
+    @cached_property
     def db(self) -> Any:
         """Lazy load database connection to avoid circular imports"""
         from ..db.connection import get_db
         return get_db()
 
     def _initialize_bloomberg(self) -> None:
-        """Initialize Bloomberg API connection (for blpapi only)"""
+        """Initialize Bloomberg API connection pool (for blpapi only)"""
         if BLOOMBERG_TYPE != "blpapi":
             return
-            
+
+        try:
+            session = self._start_session()
+        except RuntimeError:
+            self._is_connected = False
+            raise
+        with self._pool_lock:
+            retired = self._idle
+            self._sessions = [session]
+            self._idle = queue.Queue()
+            self._idle.put(session)
+        self._is_connected = True
+
+        # Stop idle sessions from the previous pool; busy ones stop when released
+        while not retired.empty():
+            self._stop_session(retired.get_nowait())
+
+    def _start_session(self) -> Any:
+        """Start the blpapi session and open the reference data service"""
         try:
             # Session options
             sessionOptions = blpapi.SessionOptions()
@@ -92,36 +189,148 @@ class BloombergService:
             logger.info(f"Connecting to Bloomberg at {host}:{port}")
             
             # Create session
-            self._session = blpapi.Session(sessionOptions)
+            session = blpapi.Session(sessionOptions)
             
             # Start session
-            if not self._session.start():
+            if not session.start():
                 logger.error("Failed to start Bloomberg session")
                 raise RuntimeError("Failed to connect to Bloomberg")
                 
             # Open service
-            if not self._session.openService("//blp/refdata"):
+            if not session.openService("//blp/refdata"):
                 logger.error("Failed to open Bloomberg reference data service")
-                self._session.stop()
+                session.stop()
                 raise RuntimeError("Failed to open Bloomberg service")
                 
-            self._is_connected = True
             logger.info("Successfully connected to Bloomberg API")
+            return session
             
         except Exception as e:
             logger.error(f"Failed to initialize Bloomberg: {e}")
-            self._is_connected = False
             raise RuntimeError(f"Bloomberg connection failed: {e}")
 
+    def _stop_session(self, session: Any) -> None:
+        """Stop a blpapi session, logging rather than raising on failure"""
+        try:
+            session.stop()
+        except Exception as e:
+            logger.warning(f"Error stopping Bloomberg session: {e}")
+
+    def _grow_pool(self) -> Optional[Any]:
+        """Start another pooled session, or None if the pool is already full"""
+        with self._pool_lock:
+            if not self._sessions or len(self._sessions) >= BLOOMBERG_POOL_SIZE:
+                return None
+
+        # Connect outside the lock so returning sessions never wait on it. A
+        # failed extra session leaves the working pool (and status) as it was
+        try:
+            session = self._start_session()
+        except RuntimeError:
+            return None
+
+        with self._pool_lock:
+            # Other borrowers may have filled the pool while we connected
+            if self._sessions and len(self._sessions) < BLOOMBERG_POOL_SIZE:
+                self._sessions.append(session)
+                return session
+        self._stop_session(session)
+        return None
+
+    def _wait_for_session(self) -> Any:
+        """Wait for an idle session, re-reading the pool in case a reconnect replaced it"""
+        deadline = time.monotonic() + SESSION_WAIT_TIMEOUT
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise RuntimeError("No Bloomberg session became available")
+            try:
+                return self._idle.get(timeout=min(remaining, SESSION_POLL_INTERVAL))
+            except queue.Empty:
+                continue
+
+    @contextmanager
+    def _borrow_session(self) -> Iterator[Any]:
+        """Borrow a blpapi session for one request/response cycle"""
+        try:
+            session = self._idle.get_nowait()
+        except queue.Empty:
+            session = self._grow_pool()
+            if session is None:
+                session = self._wait_for_session()
+
+        try:
+            yield session
+        finally:
+            with self._pool_lock:
+                current = any(s is session for s in self._sessions)
+                if current:
+                    self._idle.put(session)
+            # Sessions replaced by a reconnect while in use are stopped on return
+            if not current:
+                self._stop_session(session)
+
+    def reconnect(self) -> None:
+        """Replace the current Bloomberg session with a freshly started one"""
+        if not BLOOMBERG_AVAILABLE:
+            return
+
+        if BLOOMBERG_TYPE == "xbbg":
+            self._is_connected = self._test_xbbg_connection()
+            if self._is_connected:
+                self._startup_error = None
+            return
+
+        # The previous pool is only retired once the new session is live
+        self._initialize_bloomberg()
+        self._startup_error = None
+
+    def _try_reconnect(self) -> bool:
+        """Reconnect after a lost connection, backing off while Bloomberg stays down"""
+        if not self._reconnect_lock.acquire(blocking=False):
+            return False
+
+        try:
+            now = time.monotonic()
+            if now - self._last_reconnect < self._reconnect_backoff:
+                return False
+            self._last_reconnect = now
+
+            logger.warning("Bloomberg not connected, attempting to reconnect...")
+            if BLOOMBERG_TYPE == "blpapi":
+                try:
+                    self._initialize_bloomberg()
+                except Exception as e:
+                    logger.error(f"Failed to reconnect to Bloomberg: {e}")
+            else:
+                self._is_connected = self._test_xbbg_connection()
+
+            if self._is_connected:
+                self._reconnect_backoff = RECONNECT_BACKOFF_MIN
+            else:
+                self._reconnect_backoff = min(
+                    self._reconnect_backoff * 2, RECONNECT_BACKOFF_MAX
+                )
+            return self._is_connected
+        finally:
+            self._reconnect_lock.release()
+
     def get_connection_status(self) -> Dict[str, Any]:
         """Get the current Bloomberg connection status"""
-        return {
+        key = (self._is_connected, self._startup_error)
+        cached = self._status_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        status = {
             "bloomberg_available": BLOOMBERG_AVAILABLE,
             "bloomberg_type": BLOOMBERG_TYPE,
             "is_connected": self._is_connected,
             "status": "connected" if self._is_connected else "disconnected",
             "message": self._get_status_message()
         }
+        self._status_cache = (key, status)
+        return status
 
     def _get_status_message(self) -> str:
         """Get a descriptive status message"""
@@ -136,92 +345,248 @@ class BloombergService:
 
     def _cache_real_time_data(self, data: List[Dict[str, Any]]) -> None:
         """Cache real-time data in DuckDB"""
+        if not data:
+            return
+
         try:
-            conn = self.db.get_connection()
-
-            for item in data:
-                # First, ensure ticker exists
-                ticker_result = conn.execute(
-                    "SELECT id FROM tickers WHERE symbol = ?", [item["symbol"]]
-                ).fetchone()
-
-                if not ticker_result:
-                    # Create ticker if it doesn't exist
-                    max_id = conn.execute(
-                        "SELECT COALESCE(MAX(id), 0) + 1 FROM tickers"
-                    ).fetchone()[0]
+            now = datetime.now(timezone.utc)
+
+            # One row per symbol; later quotes for the same symbol win
+            by_symbol = {item["symbol"]: item for item in data}
+            quotes = pd.DataFrame(
+                {
+                    "symbol": list(by_symbol),
+                    "description": [item.get("description", "") for item in by_symbol.values()],
+                    "product_category": [item.get("product_category", "") for item in by_symbol.values()],
+                    "px_last": [item.get("px_last", 0) for item in by_symbol.values()],
+                }
+            )
+
+            # New tickers and their prices commit together, or not at all
+            with self.db.transaction() as conn:
+                conn.register("quotes", quotes)
+                try:
+                    # Create any tickers we haven't seen before, in one statement
+                    created = conn.execute(
+                        """
+                        INSERT INTO tickers (symbol, description, product_category, created_at)
+                        SELECT q.symbol, q.description, q.product_category, ?
+                        FROM quotes q ANTI JOIN tickers t ON t.symbol = q.symbol
+                    """,
+                        [now],
+                    ).fetchone()
+
+                    # Keep one live quote per ticker per day: the refresher
+                    # writes every few seconds, so each write replaces the
+                    # day's previous quote rather than adding a row
                     conn.execute(
                         """
-                        INSERT INTO tickers (id, symbol, description, product_category, created_at)
-                        VALUES (?, ?, ?, ?, ?)
+                        DELETE FROM price_data
+                        WHERE is_intraday
+                        AND date >= date_trunc('day', ?::TIMESTAMP)
+                        AND ticker_id IN (
+                            SELECT t.id FROM quotes q JOIN tickers t ON t.symbol = q.symbol
+                        )
                     """,
-                        [
-                            max_id,
-                            item["symbol"],
-                            item.get("description", ""),
-                            item.get("product_category", ""),
-                            datetime.now(timezone.utc),
-                        ],
+                        [now],
                     )
-                    ticker_id = max_id
-                else:
-                    ticker_id = ticker_result[0]
 
-                # Insert price data
-                max_price_id = conn.execute(
-                    "SELECT COALESCE(MAX(id), 0) + 1 FROM price_data"
-                ).fetchone()[0]
+                    # Insert price data for every quote in one statement
+                    conn.execute(
+                        """
+                        INSERT INTO price_data (ticker_id, symbol, date, px_last, is_intraday)
+                        SELECT t.id, q.symbol, ?, q.px_last, TRUE
+                        FROM quotes q JOIN tickers t ON t.symbol = q.symbol
+                        WHERE q.px_last IS NOT NULL
+                        ON CONFLICT (ticker_id, date) DO UPDATE SET
+                            px_last = excluded.px_last,
+                            updated_at = now(),
+                            is_intraday = TRUE
+                    """,
+                        [now],
+                    )
+                finally:
+                    conn.unregister("quotes")
 
-                conn.execute(
-                    """
-                    INSERT INTO price_data (id, ticker_id, symbol, date, px_last)
-                    VALUES (?, ?, ?, ?, ?)
-                    ON CONFLICT (ticker_id, date) DO UPDATE SET
-                        px_last = excluded.px_last
-                """,
-                    [
-                        max_price_id,
-                        ticker_id,
-                        item["symbol"],
-                        datetime.now(timezone.utc),
-                        item.get("px_last", 0),
-                    ],
-                )
+            if created and created[0]:
+                TickerService.bump_version()
 
             logger.info(f"Cached {len(data)} real-time price records")
 
         except Exception as e:
             logger.error(f"Error caching real-time data: {e}")
 
+    def _submit_cache_write(self, write: Callable[..., None], *args: Any) -> bool:
+        """Run a cache write on the writer thread; False if skipped because closed"""
+        try:
+            self._cache_writer.submit(write, *args)
+        except RuntimeError:
+            # close() shut the writer down; the fetched data is still returned
+            logger.debug("Cache writer closed - skipping cache write")
+            return False
+        return True
+
+    def _queue_real_time_write(self, data: List[Dict[str, Any]]) -> None:
+        """Queue quotes for the cache writer, coalescing with any not yet written"""
+        with self._pending_lock:
+            self._pending_quotes.extend(data)
+            if self._drain_scheduled:
+                return
+            self._drain_scheduled = True
+        if not self._submit_cache_write(self._drain_real_time_writes):
+            # No drain will run after close(), so don't let quotes pile up
+            with self._pending_lock:
+                self._pending_quotes = []
+                self._drain_scheduled = False
+
+    def _drain_real_time_writes(self) -> None:
+        """Write every queued quote in a single cache call"""
+        with self._pending_lock:
+            data, self._pending_quotes = self._pending_quotes, []
+            self._drain_scheduled = False
+        self._cache_real_time_data(data)
+
+    def _cache_historical_data(self, symbol: str, data: List[Dict[str, Any]]) -> None:
+        """Cache historical data in DuckDB"""
+        self._cache_historical_data_bulk({symbol: data})
+
+    def _cache_historical_data_bulk(self, data: Dict[str, List[Dict[str, Any]]]) -> None:
+        """Cache historical data for several symbols in DuckDB"""
+        try:
+            history = pd.DataFrame(
+                {
+                    "symbol": [symbol for symbol, points in data.items() for _ in points],
+                    "date": np.array(
+                        [item["date"] for points in data.values() for item in points],
+                        dtype="datetime64[D]",
+                    ),
+                    "px_last": [item["price"] for points in data.values() for item in points],
+                }
+            )
+            if history.empty:
+                return
+            priced = int(history["px_last"].notna().sum())
+
+            with self.db.transaction() as conn:
+                conn.register("history", history)
+                try:
+                    # Ticker ids are resolved by the join, not a lookup per symbol
+                    written = conn.execute(
+                        """
+                        INSERT INTO price_data (ticker_id, symbol, date, px_last)
+                        SELECT t.id, h.symbol, h.date, h.px_last
+                        FROM history h JOIN tickers t ON t.symbol = h.symbol
+                        WHERE h.px_last IS NOT NULL AND NOT isnan(h.px_last)
+                        ON CONFLICT (ticker_id, date) DO UPDATE SET
+                            px_last = excluded.px_last,
+                            updated_at = now(),
+                            is_intraday = FALSE
+                    """
+                    ).fetchone()
+
+                    # Only name the missing tickers when some rows had nowhere to go
+                    if written is not None and written[0] < priced:
+                        unknown = conn.execute(
+                            """
+                            SELECT DISTINCT h.symbol
+                            FROM history h ANTI JOIN tickers t ON t.symbol = h.symbol
+                        """
+                        ).fetchall()
+                        for (symbol,) in unknown:
+                            logger.warning(f"Ticker {symbol} not found for caching historical data")
+                finally:
+                    conn.unregister("history")
+
+            logger.info(
+                f"Cached {len(history)} historical records for {len(data)} symbols"
+            )
+
+        except Exception as e:
+            logger.error(f"Error caching historical data: {e}")
+
+    def _get_cached_historical_data(
+        self, symbol: str, start_date: datetime, end_date: datetime
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Try to get historical data from cache"""
+        return self._get_cached_historical_data_bulk([symbol], start_date, end_date).get(symbol)
+
+    def _get_cached_historical_data_bulk(
+        self, symbols: List[str], start_date: datetime, end_date: datetime
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Get cached history for every symbol with enough coverage"""
+        if not symbols or end_date < start_date:
+            return {}
+
+        # Need bars for most trading days (at least 80% coverage); daily history
+        # has no weekend bars, and the slack absorbs exchange holidays
+        expected_days = int(
+            np.busday_count(start_date.date(), end_date.date() + timedelta(days=1))
+        )
+
+        try:
+            # Coverage is checked per symbol in SQL, so one round trip returns
+            # rows only for symbols that pass and nothing at all on a miss.
+            # Dates are formatted by DuckDB and fetched as columns, so no
+            # per-row datetime objects or strftime calls on the Python side.
+            # Only daily bars written within the TTL count: live quotes share
+            # the table but are never history, and expired bars are refetched.
+            # Coverage is measured in distinct days and each day returns only
+            # its latest bar
+            result = self.db.fetchnumpy(
+                """
+                SELECT t.symbol, strftime(pd.date, '%Y-%m-%d') AS date, pd.px_last
+                FROM price_data pd
+                JOIN tickers t ON pd.ticker_id = t.id
+                WHERE t.symbol = ANY(?)
+                AND date >= ?
+                AND date <= ?
+                AND NOT pd.is_intraday
+                AND pd.updated_at >= now()::TIMESTAMP - to_seconds(?)
+                QUALIFY ROW_NUMBER() OVER (
+                    PARTITION BY t.symbol, CAST(pd.date AS DATE) ORDER BY pd.date DESC
+                ) = 1
+                AND COUNT(DISTINCT CAST(pd.date AS DATE)) OVER (PARTITION BY t.symbol) >= ?
+                ORDER BY t.symbol, pd.date
+            """,
+                [symbols, start_date, end_date, HISTORY_CACHE_TTL, expected_days * 0.8],
+            )
+        except Exception as e:
+            logger.error(f"Error reading cached data: {e}")
+            return {}
+
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for symbol, date, price in zip(
+            result["symbol"].tolist(), result["date"].tolist(), result["px_last"].tolist()
+        ):
+            grouped.setdefault(symbol, []).append({"date": date, "price": price})
+
+        if grouped:
+            logger.info(f"Using cached data for {len(grouped)} of {len(symbols)} symbols")
+        return grouped
+
     def get_real_time_data(self, symbols: List[str]) -> List[Dict[str, Any]]:
         """Get real-time price data for given symbols"""
         if not BLOOMBERG_AVAILABLE or self._startup_error:
             logger.warning("Bloomberg API not available - returning empty data")
             return []
 
-        if not self._is_connected:
-            logger.warning("Bloomberg not connected, attempting to reconnect...")
-            if BLOOMBERG_TYPE == "blpapi":
-                try:
-                    self._initialize_bloomberg()
-                except Exception as e:
-                    logger.error(f"Failed to reconnect to Bloomberg: {e}")
-                    return []
-            else:
-                self._is_connected = self._test_xbbg_connection()
-            
-            if not self._is_connected:
-                logger.error("Failed to connect to Bloomberg Terminal")
-                return []
+        if not self._is_connected and not self._try_reconnect():
+            logger.debug("Bloomberg Terminal not connected - returning empty data")
+            return []
+
+        # Each security costs quota, so request it once even if listed twice
+        symbols = list(dict.fromkeys(symbols))
 
         try:
             if BLOOMBERG_TYPE == "blpapi":
-                data = self._get_bloomberg_real_time_data(symbols)
+                with self._borrow_session() as session:
+                    data = self._get_bloomberg_real_time_data(session, symbols)
             else:
-                data = self._get_xbbg_real_time_data(symbols)
+                with self._request_lock:
+                    data = self._get_xbbg_real_time_data(symbols)
                 
             if data:
-                self._cache_real_time_data(data)
+                self._queue_real_time_write(data)
             return data
         except Exception as e:
             logger.error(f"Error fetching real-time data from Bloomberg: {e}")
@@ -233,25 +598,26 @@ class BloombergService:
         
         results = []
         try:
-            # xbbg needs specific ticker format with asset class
-            formatted_symbols = []
+            # xbbg needs specific ticker format with asset class; remember the
+            # caller's symbol so results are keyed the way they were requested
+            requested = {}
             for symbol in symbols:
                 if not any(suffix in symbol for suffix in [' Comdty', ' Curncy', ' Equity', ' Index']):
                     # Default to Comdty for metals
-                    formatted_symbols.append(f"{symbol} Comdty")
+                    requested[f"{symbol} Comdty"] = symbol
                 else:
-                    formatted_symbols.append(symbol)
+                    requested[symbol] = symbol
             
             # Request data
             fields = ['PX_LAST', 'NAME', 'CHG_NET_1D', 'CHG_PCT_1D']
-            data = blp.bdp(tickers=formatted_symbols, flds=fields)
+            data = blp.bdp(tickers=list(requested), flds=fields)
             
             logger.info(f"xbbg returned data for {len(data)} symbols")
             
             # Convert to expected format
             for ticker, row in data.iterrows():
                 result = {
-                    "symbol": ticker,
+                    "symbol": requested.get(ticker, ticker),
                     "px_last": float(row.get('PX_LAST', 0)) if row.get('PX_LAST') is not None else 0.0,
                     "change": float(row.get('CHG_NET_1D', 0)) if row.get('CHG_NET_1D') is not None else 0.0,
                     "change_pct": float(row.get('CHG_PCT_1D', 0)) if row.get('CHG_PCT_1D') is not None else 0.0,
@@ -275,13 +641,12 @@ class BloombergService:
         else:
             return "OTHER"
 
-    def _get_bloomberg_real_time_data(self, symbols: List[str]) -> List[Dict[str, Any]]:
+    def _get_bloomberg_real_time_data(
+        self, session: Any, symbols: List[str]
+    ) -> List[Dict[str, Any]]:
         """Get real-time data from Bloomberg API (blpapi)"""
-        if not self._session:
-            raise RuntimeError("Bloomberg session not available")
-
         # Get the reference data service
-        service = self._session.getService("//blp/refdata")
+        service = session.getService("//blp/refdata")
         
         # Use ReferenceDataRequest which is more widely supported
         request = service.createRequest("ReferenceDataRequest")
@@ -293,26 +658,34 @@ class BloombergService:
 
         # Add fields - use basic fields that are commonly available
         fields = request.getElement("fields")
-        field_list = ["PX_LAST", "NAME", "GICS_SECTOR_NAME"]
-        for field in field_list:
+        for field in REFERENCE_FIELDS:
             fields.appendValue(field)
 
         # Send request
-        request_id = self._session.sendRequest(request)
+        request_id = blpapi.CorrelationId(next(_correlation_ids))
+        session.sendRequest(request, correlationId=request_id)
         logger.info(f"Sent Bloomberg request for symbols: {symbols}")
 
         # Process response
         results = []
+        complete = False
         try:
-            while True:
-                event = self._session.nextEvent(5000)  # 5 second timeout
+            while not complete:
+                event = session.nextEvent(5000)  # 5 second timeout
                 
                 if event.eventType() == blpapi.Event.TIMEOUT:
                     logger.warning("Bloomberg request timed out")
                     break
                     
-                elif event.eventType() == blpapi.Event.RESPONSE:
+                # Large requests are split across partial responses
+                elif event.eventType() in (blpapi.Event.PARTIAL_RESPONSE, blpapi.Event.RESPONSE):
                     for msg in event:
+                        # Skip late replies to earlier requests on this session
+                        if request_id not in msg.correlationIds():
+                            continue
+                        if event.eventType() == blpapi.Event.RESPONSE:
+                            complete = True
+
                         if msg.hasElement("securityData"):
                             security_data = msg.getElement("securityData")
                             for i in range(security_data.numValues()):
@@ -325,35 +698,13 @@ class BloombergService:
                                     logger.warning(f"Security error for {symbol}: {error}")
                                     continue
                                 
-                                field_data = security.getElement("fieldData")
-                                
                                 result = {
                                     "symbol": symbol,
-                                    "px_last": (
-                                        field_data.getElementAsFloat("PX_LAST")
-                                        if field_data.hasElement("PX_LAST") and not field_data.getElement("PX_LAST").isNull()
-                                        else 0.0
-                                    ),
                                     "change": 0.0,  # Not available in reference data
                                     "change_pct": 0.0,  # Not available in reference data
-                                    "description": (
-                                        field_data.getElementAsString("NAME")
-                                        if field_data.hasElement("NAME") and not field_data.getElement("NAME").isNull()
-                                        else ""
-                                    ),
-                                    "product_category": (
-                                        field_data.getElementAsString("GICS_SECTOR_NAME")
-                                        if field_data.hasElement("GICS_SECTOR_NAME") and not field_data.getElement("GICS_SECTOR_NAME").isNull()
-                                        else "Unknown"
-                                    ),
+                                    **_extract_reference_fields(security.getElement("fieldData")),
                                 }
                                 results.append(result)
-                                logger.info(f"Retrieved data for {symbol}: {result['px_last']}")
-                    break
-                    
-                elif event.eventType() == blpapi.Event.PARTIAL_RESPONSE:
-                    # Continue processing partial responses
-                    continue
                     
         except Exception as e:
             logger.error(f"Error processing Bloomberg response: {e}")
@@ -365,24 +716,76 @@ class BloombergService:
         self, symbol: str, start_date: datetime, end_date: datetime
     ) -> List[Dict[str, Any]]:
         """Get historical price data for a symbol"""
+        # First check cache
+        cached_data = self._get_cached_historical_data(symbol, start_date, end_date)
+        if cached_data:
+            return cached_data
+
         if not BLOOMBERG_AVAILABLE or self._startup_error:
             logger.warning("Bloomberg API not available for historical data - returning empty data")
             return []
 
-        if not self._is_connected:
+        if not self._is_connected and not self._try_reconnect():
             logger.warning("Bloomberg not connected for historical data")
             return []
 
         try:
             if BLOOMBERG_TYPE == "xbbg":
-                return self._get_xbbg_historical_data(symbol, start_date, end_date)
+                with self._request_lock:
+                    results = self._get_xbbg_historical_data(symbol, start_date, end_date)
             else:
-                # Original blpapi implementation
-                return self._get_blpapi_historical_data(symbol, start_date, end_date)
+                with self._borrow_session() as session:
+                    results = self._get_blpapi_historical_data(
+                        session, symbol, start_date, end_date
+                    )
         except Exception as e:
             logger.error(f"Error fetching historical data: {e}")
             return []
 
+        # Cache the historical data
+        if results:
+            self._submit_cache_write(self._cache_historical_data, symbol, results)
+
+        return results
+
+    def get_historical_data_bulk(
+        self, symbols: List[str], start_date: datetime, end_date: datetime
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Get historical price data for several symbols, batching Bloomberg requests"""
+        symbols = list(dict.fromkeys(symbols))
+        results = self._get_cached_historical_data_bulk(symbols, start_date, end_date)
+        missing = [symbol for symbol in symbols if symbol not in results]
+
+        if missing and (not BLOOMBERG_AVAILABLE or self._startup_error):
+            logger.warning("Bloomberg API not available for historical data - returning cached data")
+            missing = []
+        elif missing and not self._is_connected and not self._try_reconnect():
+            logger.warning("Bloomberg not connected for historical data")
+            missing = []
+
+        fetched: Dict[str, List[Dict[str, Any]]] = {}
+        try:
+            if BLOOMBERG_TYPE == "xbbg":
+                for i in range(0, len(missing), HISTORICAL_BATCH_SIZE):
+                    batch = missing[i : i + HISTORICAL_BATCH_SIZE]
+                    with self._request_lock:
+                        fetched.update(
+                            self._get_xbbg_historical_data_bulk(batch, start_date, end_date)
+                        )
+            elif missing:
+                with self._borrow_session() as session:
+                    fetched = self._get_blpapi_historical_data_bulk(
+                        session, missing, start_date, end_date
+                    )
+        except Exception as e:
+            logger.error(f"Error fetching historical data: {e}")
+
+        if fetched:
+            self._submit_cache_write(self._cache_historical_data_bulk, fetched)
+            results.update(fetched)
+
+        return {symbol: results.get(symbol, []) for symbol in symbols}
+
     def _get_xbbg_historical_data(
         self, symbol: str, start_date: datetime, end_date: datetime
     ) -> List[Dict[str, Any]]:
@@ -408,11 +811,17 @@ class BloombergService:
                 if isinstance(data.columns, pd.MultiIndex):
                     data.columns = [col[1] for col in data.columns]
                 
-                for date, row in data.iterrows():
-                    results.append({
-                        "date": date.strftime("%Y-%m-%d"),
-                        "price": float(row.get('PX_LAST', 0))
-                    })
+                # Convert whole columns at once instead of iterating rows
+                dates = pd.DatetimeIndex(data.index).strftime("%Y-%m-%d").tolist()
+                if 'PX_LAST' in data.columns:
+                    prices = data['PX_LAST'].to_numpy(dtype=float).tolist()
+                else:
+                    prices = [0.0] * len(dates)
+                
+                results = [
+                    {"date": date, "price": price}
+                    for date, price in zip(dates, prices)
+                ]
             
             logger.info(f"Retrieved {len(results)} historical data points for {symbol}")
             return results
@@ -421,27 +830,216 @@ class BloombergService:
             logger.error(f"Error fetching historical data from xbbg: {e}")
             return []
 
+    def _get_xbbg_historical_data_bulk(
+        self, symbols: List[str], start_date: datetime, end_date: datetime
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Get historical data for several symbols in one xbbg call"""
+        from xbbg import blp
+
+        # Bloomberg ticker -> requested symbol
+        tickers = {
+            symbol if any(suffix in symbol for suffix in [' Comdty', ' Curncy', ' Equity', ' Index'])
+            else f"{symbol} Comdty": symbol
+            for symbol in symbols
+        }
+
+        data = blp.bdh(
+            tickers=list(tickers),
+            flds='PX_LAST',
+            start_date=start_date.strftime('%Y%m%d'),
+            end_date=end_date.strftime('%Y%m%d')
+        )
+
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        if data.empty:
+            return results
+
+        for ticker, symbol in tickers.items():
+            if (ticker, 'PX_LAST') not in data.columns:
+                continue
+            # Rows are aligned across tickers, so drop days this one has no price
+            series = data[(ticker, 'PX_LAST')].dropna()
+            dates = pd.DatetimeIndex(series.index).strftime("%Y-%m-%d").tolist()
+            results[symbol] = [
+                {"date": date, "price": price}
+                for date, price in zip(dates, series.to_numpy(dtype=float).tolist())
+            ]
+
+        logger.info(f"Retrieved historical data for {len(results)} of {len(symbols)} symbols")
+        return results
+
     def _get_blpapi_historical_data(
-        self, symbol: str, start_date: datetime, end_date: datetime
+        self, session: Any, symbol: str, start_date: datetime, end_date: datetime
     ) -> List[Dict[str, Any]]:
-        """Get historical data using blpapi (original implementation)"""
-        # Original implementation code here
-        # ... (copy from original bloomberg_service.py)
-        return []
+        """Get historical data using blpapi"""
+        service = session.getService("//blp/refdata")
+        request = service.createRequest("HistoricalDataRequest")
+
+        request.getElement("securities").appendValue(symbol)
+        request.getElement("fields").appendValue("PX_LAST")
+        request.set("startDate", start_date.strftime("%Y%m%d"))
+        request.set("endDate", end_date.strftime("%Y%m%d"))
+        request.set("periodicitySelection", "DAILY")
+
+        logger.info(f"Requesting historical data for {symbol} from {start_date.date()} to {end_date.date()}")
+        request_id = blpapi.CorrelationId(next(_correlation_ids))
+        session.sendRequest(request, correlationId=request_id)
+
+        # Process response
+        results = []
+        complete = False
+        while not complete:
+            event = session.nextEvent(10000)  # 10 second timeout
+
+            if event.eventType() == blpapi.Event.TIMEOUT:
+                logger.warning("Bloomberg historical data request timed out")
+                break
+
+            # Long series can arrive over several partial responses
+            elif event.eventType() in (blpapi.Event.PARTIAL_RESPONSE, blpapi.Event.RESPONSE):
+                for msg in event:
+                    # Skip late replies to earlier requests on this session
+                    if request_id not in msg.correlationIds():
+                        continue
+                    if event.eventType() == blpapi.Event.RESPONSE:
+                        complete = True
+
+                    if msg.hasElement("securityData"):
+                        security_data = msg.getElement("securityData")
+
+                        # Check for security errors
+                        if security_data.hasElement("securityError"):
+                            error = security_data.getElement("securityError")
+                            logger.warning(f"Security error for {symbol}: {error}")
+                            break
+
+                        if security_data.hasElement("fieldData"):
+                            field_data = security_data.getElement("fieldData")
+
+                            for i in range(field_data.numValues()):
+                                data_point = field_data.getValueAsElement(i)
+                                if data_point.hasElement("date") and data_point.hasElement("PX_LAST"):
+                                    date = data_point.getElementAsDatetime("date")
+                                    price = data_point.getElementAsFloat("PX_LAST")
+
+                                    results.append(
+                                        {"date": date.strftime("%Y-%m-%d"), "price": price}
+                                    )
+
+        logger.info(f"Retrieved {len(results)} historical data points for {symbol}")
+        return results
+
+    def _get_blpapi_historical_data_bulk(
+        self, session: Any, symbols: List[str], start_date: datetime, end_date: datetime
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Get historical data for several symbols, pipelining one blpapi request per batch"""
+        service = session.getService("//blp/refdata")
+
+        # Send every batch before reading any response, so their round trips overlap
+        sent = []
+        for i in range(0, len(symbols), HISTORICAL_BATCH_SIZE):
+            request = service.createRequest("HistoricalDataRequest")
+
+            securities = request.getElement("securities")
+            for symbol in symbols[i : i + HISTORICAL_BATCH_SIZE]:
+                securities.appendValue(symbol)
+            request.getElement("fields").appendValue("PX_LAST")
+            request.set("startDate", start_date.strftime("%Y%m%d"))
+            request.set("endDate", end_date.strftime("%Y%m%d"))
+            request.set("periodicitySelection", "DAILY")
+
+            request_id = blpapi.CorrelationId(next(_correlation_ids))
+            session.sendRequest(request, correlationId=request_id)
+            sent.append(request_id)
+
+        logger.info(f"Requesting historical data for {len(symbols)} symbols in {len(sent)} batches from {start_date.date()} to {end_date.date()}")
+
+        # Each security comes back in its own message, across partial responses;
+        # a batch is complete once its final RESPONSE arrives
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        pending = list(sent)
+        while pending:
+            event = session.nextEvent(10000)  # 10 second timeout
+
+            if event.eventType() == blpapi.Event.TIMEOUT:
+                logger.warning("Bloomberg historical data request timed out")
+                break
+
+            if event.eventType() in (blpapi.Event.PARTIAL_RESPONSE, blpapi.Event.RESPONSE):
+                for msg in event:
+                    # Skip late replies to earlier requests on this session
+                    ours = [cid for cid in msg.correlationIds() if cid in sent]
+                    if not ours:
+                        continue
+                    if event.eventType() == blpapi.Event.RESPONSE:
+                        pending = [cid for cid in pending if cid not in ours]
+
+                    if not msg.hasElement("securityData"):
+                        continue
+                    security_data = msg.getElement("securityData")
+                    symbol = security_data.getElementAsString("security")
+
+                    if security_data.hasElement("securityError"):
+                        error = security_data.getElement("securityError")
+                        logger.warning(f"Security error for {symbol}: {error}")
+                        continue
+
+                    points = results.setdefault(symbol, [])
+                    if security_data.hasElement("fieldData"):
+                        field_data = security_data.getElement("fieldData")
+
+                        for i in range(field_data.numValues()):
+                            data_point = field_data.getValueAsElement(i)
+                            if data_point.hasElement("date") and data_point.hasElement("PX_LAST"):
+                                date = data_point.getElementAsDatetime("date")
+                                price = data_point.getElementAsFloat("PX_LAST")
+
+                                points.append(
+                                    {"date": date.strftime("%Y-%m-%d"), "price": price}
+                                )
+
+        logger.info(f"Retrieved historical data for {len(results)} of {len(symbols)} symbols")
+        return results
 
     def close(self) -> None:
         """Close Bloomberg connection"""
-        if self._session and self._is_connected and BLOOMBERG_TYPE == "blpapi":
-            try:
-                self._session.stop()
-                logger.info("Bloomberg session closed")
-            except Exception as e:
-                logger.error(f"Error closing Bloomberg session: {e}")
+        # Let queued cache writes finish before shutting down
+        self._cache_writer.shutdown(wait=True)
+
+        if BLOOMBERG_TYPE != "blpapi":
+            return
+
+        with self._pool_lock:
+            sessions, self._sessions = self._sessions, []
+            self._idle = queue.Queue()
+        self._is_connected = False
+
+        for session in sessions:
+            self._stop_session(session)
+        if sessions:
+            logger.info(f"Closed {len(sessions)} Bloomberg session(s)")
+
+
+# Shared instance, created on first use so importing this module never connects
+_service: Optional[BloombergService] = None
+_service_lock = threading.Lock()
+
+
+def get_bloomberg_service() -> BloombergService:
+    """Get the shared Bloomberg service, connecting on first use"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = BloombergService()
+    return _service
 
 
-# Global instance
-bloomberg_service = BloombergService()
+def close_bloomberg_service() -> None:
+    """Close the shared Bloomberg service if it was ever started"""
+    global _service
+    with _service_lock:
+        if _service is not None:
+            _service.close()
+            _service = None
 
-# Add pandas import if using xbbg
-if BLOOMBERG_TYPE == "xbbg":
-    import pandas as pd 
\ No newline at end of file
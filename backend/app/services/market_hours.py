@@ -0,0 +1,67 @@
+"""
+LME trading schedule
+Precomputed (weekday, hour) table shared by the market-status endpoints
+"""
+
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
+
+# LME is open Mon-Fri 01:00-19:00 UTC
+OPEN_HOUR = 1
+CLOSE_HOUR = 19
+
+HOURS_PER_WEEK = 7 * 24
+
+# (weekday, hour) slots during which the market is open
+_OPEN = frozenset(
+    (weekday, hour) for weekday in range(5) for hour in range(OPEN_HOUR, CLOSE_HOUR)
+)
+
+
+def _build_transition_table() -> Dict[Tuple[int, int], int]:
+    """Hours from the start of each weekly slot until the market opens or closes"""
+    slots = [(i // 24, i % 24) for i in range(HOURS_PER_WEEK)]
+    table = {}
+    for i, slot in enumerate(slots):
+        is_open = slot in _OPEN
+        hours = 1
+        while (slots[(i + hours) % HOURS_PER_WEEK] in _OPEN) == is_open:
+            hours += 1
+        table[slot] = hours
+    return table
+
+
+_HOURS_TO_TRANSITION = _build_transition_table()
+
+
+class MarketState(NamedTuple):
+    """Current LME market state"""
+
+    is_open: bool
+    message: str
+    next_open: Optional[datetime]
+    next_close: Optional[datetime]
+
+
+@lru_cache(maxsize=1)
+def _state_for_hour(hour_start: datetime) -> MarketState:
+    """Market state for the hour beginning at hour_start"""
+    slot = (hour_start.weekday(), hour_start.hour)
+    next_transition = hour_start + timedelta(hours=_HOURS_TO_TRANSITION[slot])
+
+    if slot in _OPEN:
+        return MarketState(True, "Market open", None, next_transition)
+
+    if slot[0] >= 5:
+        message = "Market closed - Weekend"
+    elif slot[1] < OPEN_HOUR:
+        message = "Market closed - Pre-market"
+    else:
+        message = "Market closed - After hours"
+    return MarketState(False, message, next_transition, None)
+
+
+def lme_state(now: datetime) -> MarketState:
+    """Get the LME market state at `now` (UTC)"""
+    return _state_for_hour(now.replace(minute=0, second=0, microsecond=0))
@@ -0,0 +1,89 @@
+"""
+Background Bloomberg price refresher
+Keeps a snapshot of live quotes for every tracked ticker so polls never wait on Bloomberg
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from . import quote_cache
+from .bloomberg_service import BLOOMBERG_AVAILABLE, get_bloomberg_service
+from .ticker_service import TickerService
+
+logger = logging.getLogger(__name__)
+
+# Seconds between background refreshes
+REFRESH_INTERVAL = float(os.getenv("PRICE_REFRESH_SECONDS", "2"))
+
+# Snapshots older than this many intervals are treated as unavailable
+STALE_AFTER_INTERVALS = 3
+
+# symbol -> latest quote; rebound (never mutated) on every refresh
+SNAPSHOT: Dict[str, Dict[str, Any]] = {}
+_last_refresh = 0.0
+
+_ticker_service = TickerService()
+_tracked: List[str] = []
+_tracked_version = -1
+
+
+def _tracked_symbols() -> List[str]:
+    """Get all ticker symbols, reloading only after the ticker table changes"""
+    global _tracked, _tracked_version
+
+    version = TickerService.get_version()
+    if version != _tracked_version:
+        _tracked = sorted(_ticker_service.get_all_symbols())
+        _tracked_version = version
+    return _tracked
+
+
+async def refresh_once() -> None:
+    """Fetch quotes for all tracked symbols and publish a new snapshot"""
+    global SNAPSHOT, _last_refresh
+
+    symbols = await asyncio.to_thread(_tracked_symbols)
+    data = []
+    if symbols:
+        data = await asyncio.to_thread(
+            get_bloomberg_service().get_real_time_data, symbols
+        )
+
+    now = time.monotonic()
+    SNAPSHOT = {item["symbol"]: item for item in data}
+    _last_refresh = now
+
+    # Keep the per-symbol cache warm for /prices/latest as well
+    quote_cache.set_many(now, SNAPSHOT)
+
+
+async def refresher(interval: float = REFRESH_INTERVAL) -> None:
+    """Refresh the snapshot every `interval` seconds until cancelled"""
+    while True:
+        try:
+            await refresh_once()
+        except Exception as e:
+            logger.error(f"Background price refresh failed: {e}")
+        await asyncio.sleep(interval)
+
+
+def start() -> Optional["asyncio.Task[None]"]:
+    """Start the background refresher if Bloomberg is available"""
+    if not BLOOMBERG_AVAILABLE:
+        logger.info("Bloomberg not available - background price refresh disabled")
+        return None
+    return asyncio.create_task(refresher())
+
+
+def get_snapshot(
+    max_age: float = REFRESH_INTERVAL * STALE_AFTER_INTERVALS,
+) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Get the latest snapshot, or None if it is stale or predates a ticker change"""
+    if time.monotonic() - _last_refresh > max_age:
+        return None
+    if _tracked_version != TickerService.get_version():
+        return None
+    return SNAPSHOT
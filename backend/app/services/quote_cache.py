@@ -0,0 +1,55 @@
+"""
+Short-lived in-memory cache for Bloomberg real-time quotes
+Bounds staleness to QUOTE_TTL_SECONDS so dashboard polls skip Bloomberg
+"""
+
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Tuple
+
+# Maximum age of a cached quote (seconds)
+TTL = float(os.getenv("QUOTE_TTL_SECONDS", "2"))
+
+# Maximum number of symbols kept in the cache (least recently used evicted)
+MAX_ENTRIES = 4096
+
+# symbol -> (monotonic timestamp, quote)
+CACHE: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+
+def get_many(
+    symbols: Iterable[str],
+) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """Split symbols into fresh cached quotes and misses to fetch"""
+    now = time.monotonic()
+    hits: Dict[str, Dict[str, Any]] = {}
+    misses: List[str] = []
+
+    for symbol in symbols:
+        entry = CACHE.get(symbol)
+        if entry is not None:
+            if now - entry[0] <= TTL:
+                CACHE.move_to_end(symbol)
+                hits[symbol] = entry[1]
+                continue
+            # Expired - evict lazily on read
+            del CACHE[symbol]
+        misses.append(symbol)
+
+    return hits, misses
+
+
+def set_many(now: float, quotes: Dict[str, Dict[str, Any]]) -> None:
+    """Store quotes fetched at monotonic time `now`"""
+    for symbol, quote in quotes.items():
+        CACHE[symbol] = (now, quote)
+        CACHE.move_to_end(symbol)
+
+    while len(CACHE) > MAX_ENTRIES:
+        CACHE.popitem(last=False)
+
+
+def clear() -> None:
+    """Drop all cached quotes"""
+    CACHE.clear()
@@ -0,0 +1,39 @@
+"""
+Short-lived cache for the Bloomberg connection status
+Keeps frequent health/settings polls from probing Bloomberg on every request
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .bloomberg_service import get_bloomberg_service
+
+# Default status freshness (seconds)
+STATUS_TTL = 5.0
+
+_STATUS_CACHE: Dict[str, Any] = {"t": 0.0, "v": None}
+_lock = threading.Lock()
+
+
+def get_cached_status(ttl: float = STATUS_TTL) -> Dict[str, Any]:
+    """Get the Bloomberg connection status, refreshing at most once per ttl"""
+    value: Optional[Dict[str, Any]] = _STATUS_CACHE["v"]
+    if value is not None and time.monotonic() - _STATUS_CACHE["t"] < ttl:
+        return value
+
+    # Single flight: concurrent readers of an expired entry wait for one refresh
+    with _lock:
+        value = _STATUS_CACHE["v"]
+        if value is None or time.monotonic() - _STATUS_CACHE["t"] >= ttl:
+            value = get_bloomberg_service().get_connection_status()
+            _STATUS_CACHE["v"] = value
+            _STATUS_CACHE["t"] = time.monotonic()
+        return value
+
+
+def invalidate() -> None:
+    """Force the next status read to query the Bloomberg service"""
+    with _lock:
+        _STATUS_CACHE["v"] = None
+        _STATUS_CACHE["t"] = 0.0
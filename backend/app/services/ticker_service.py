@@ -1,6 +1,8 @@
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import pandas as pd
 
 from ..db.connection import get_db
 from ..models.ticker import (
@@ -17,9 +19,22 @@ logger = logging.getLogger(__name__)
 class TickerService:
     """Service for managing tickers and price data"""
 
+    # Incremented on every ticker mutation so callers can invalidate derived data
+    _version = 0
+
     def __init__(self) -> None:
         self.db = get_db()
 
+    @classmethod
+    def get_version(cls) -> int:
+        """Get the current ticker table version"""
+        return cls._version
+
+    @classmethod
+    def bump_version(cls) -> None:
+        """Mark the ticker table as changed"""
+        cls._version += 1
+
     def get_all_tickers(self, product_category: Optional[str] = None) -> List[Ticker]:
         """Get all tickers, optionally filtered by product category"""
         query = "SELECT * FROM tickers"
@@ -46,6 +61,11 @@ class TickerService:
             for row in rows
         ]
 
+    def get_all_symbols(self) -> Set[str]:
+        """Get the set of all ticker symbols"""
+        columns = self.db.fetchnumpy("SELECT symbol FROM tickers")
+        return set(columns["symbol"].tolist())
+
     def get_ticker_by_id(self, ticker_id: int) -> Optional[Ticker]:
         """Get ticker by ID"""
         row = self.db.fetchone("SELECT * FROM tickers WHERE id = ?", [ticker_id])
@@ -89,41 +109,137 @@ class TickerService:
         if existing:
             raise ValueError(f"Ticker with symbol {ticker_data.symbol} already exists")
 
-        # Get next available ID
-        max_id_result = conn.execute(
-            "SELECT COALESCE(MAX(id), 0) + 1 FROM tickers"
+        # Prepare values with sensible defaults
+        description = ticker_data.description or f"{ticker_data.symbol} Price"
+        product_category = ticker_data.product_category or "OTHER"
+
+        # Insert new ticker (id comes from tickers_id_seq)
+        row = conn.execute(
+            """
+            INSERT INTO tickers (symbol, description, product_category, is_custom, created_at)
+            VALUES (?, ?, ?, ?, ?)
+            RETURNING *
+        """,
+            [
+                ticker_data.symbol,
+                description,
+                product_category,
+                ticker_data.is_custom,
+                datetime.now(),
+            ],
         ).fetchone()
 
-        if max_id_result is None:
-            raise RuntimeError("Failed to get next ID")
+        if row is None:
+            raise RuntimeError("Failed to create ticker")
 
-        next_id = max_id_result[0]
+        TickerService.bump_version()
+
+        return Ticker(
+            id=row[0],
+            symbol=row[1],
+            description=row[2],
+            product_category=row[3],
+            is_custom=bool(row[4]),
+            created_at=row[5],
+            updated_at=row[6],
+        )
+
+    def upsert_ticker(self, ticker_data: TickerCreate) -> Tuple[Ticker, bool]:
+        """Insert a ticker unless its symbol exists; returns (ticker, created)"""
+        conn = self.db.get_connection()
 
-        # Prepare values with sensible defaults
         description = ticker_data.description or f"{ticker_data.symbol} Price"
         product_category = ticker_data.product_category or "OTHER"
 
-        # Insert new ticker
-        conn.execute(
+        # Single statement: existence check, ID allocation and insert
+        row = conn.execute(
             """
-            INSERT INTO tickers (id, symbol, description, product_category, is_custom, created_at)
-            VALUES (?, ?, ?, ?, ?, ?)
+            INSERT INTO tickers (symbol, description, product_category, is_custom, created_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (symbol) DO NOTHING
+            RETURNING *
         """,
             [
-                next_id,
                 ticker_data.symbol,
                 description,
                 product_category,
                 ticker_data.is_custom,
                 datetime.now(),
             ],
+        ).fetchone()
+
+        if row is None:
+            existing = self.get_ticker_by_symbol(ticker_data.symbol)
+            if existing is None:
+                raise RuntimeError("Failed to create ticker")
+            return existing, False
+
+        TickerService.bump_version()
+
+        return (
+            Ticker(
+                id=row[0],
+                symbol=row[1],
+                description=row[2],
+                product_category=row[3],
+                is_custom=bool(row[4]),
+                created_at=row[5],
+                updated_at=row[6],
+            ),
+            True,
         )
 
-        # Return the created ticker
-        result = self.get_ticker_by_id(next_id)
-        if result is None:
-            raise RuntimeError("Failed to create ticker")
-        return result
+    def create_tickers(self, tickers: List[TickerCreate]) -> List[Ticker]:
+        """Create several tickers in one batch, skipping symbols that already exist"""
+        if not tickers:
+            return []
+
+        new_tickers = pd.DataFrame(
+            {
+                "symbol": [t.symbol for t in tickers],
+                "description": [t.description or f"{t.symbol} Price" for t in tickers],
+                "product_category": [t.product_category or "OTHER" for t in tickers],
+                "is_custom": [t.is_custom for t in tickers],
+                "created_at": [datetime.now()] * len(tickers),
+            }
+        )
+
+        # Symbols another writer added first are skipped, not a failed batch
+        with self.db.transaction() as conn:
+            conn.register("new_tickers", new_tickers)
+            try:
+                rows = conn.execute(
+                    """
+                    INSERT INTO tickers (symbol, description, product_category, is_custom, created_at)
+                    SELECT symbol, description, product_category, is_custom, created_at
+                    FROM new_tickers
+                    ON CONFLICT (symbol) DO NOTHING
+                    RETURNING *
+                """
+                ).fetchall()
+            finally:
+                conn.unregister("new_tickers")
+
+        if not rows:
+            return []
+
+        TickerService.bump_version()
+
+        # Return the tickers in the order they were requested
+        by_symbol = {row[1]: row for row in rows}
+        return [
+            Ticker(
+                id=row[0],
+                symbol=row[1],
+                description=row[2],
+                product_category=row[3],
+                is_custom=bool(row[4]),
+                created_at=row[5],
+                updated_at=row[6],
+            )
+            for row in (by_symbol.get(t.symbol) for t in tickers)
+            if row is not None
+        ]
 
     def update_ticker(
         self, ticker_id: int, ticker_data: TickerUpdate
@@ -154,6 +270,7 @@ class TickerService:
 
         query = f"UPDATE tickers SET {', '.join(updates)} WHERE id = ?"
         self.db.execute(query, params)
+        TickerService.bump_version()
 
         return self.get_ticker_by_id(ticker_id)
 
@@ -170,6 +287,7 @@ class TickerService:
 
         # Delete ticker
         conn.execute("DELETE FROM tickers WHERE id = ?", (ticker_id,))
+        TickerService.bump_version()
 
         logger.info(f"Deleted ticker {ticker.symbol} (ID: {ticker_id})")
         return True
@@ -228,15 +346,18 @@ class TickerService:
         self, product_category: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """Get latest prices for all tickers"""
+        # One hash-aggregate pass instead of sorting every ticker's history;
+        # the struct keeps NULL px_open/high/low from the latest row intact
         query = """
             SELECT t.id, t.symbol, t.description, t.product_category,
-                   p.px_last, p.date, p.px_open, p.px_high, p.px_low
+                   p.latest.px_last, p.date, p.latest.px_open, p.latest.px_high, p.latest.px_low
             FROM tickers t
             LEFT JOIN (
-                SELECT ticker_id, px_last, date, px_open, px_high, px_low,
-                       ROW_NUMBER() OVER (PARTITION BY ticker_id ORDER BY date DESC) as rn
+                SELECT ticker_id, MAX(date) AS date,
+                       ARG_MAX(STRUCT_PACK(px_last, px_open, px_high, px_low), date) AS latest
                 FROM price_data
-            ) p ON t.id = p.ticker_id AND p.rn = 1
+                GROUP BY ticker_id
+            ) p ON t.id = p.ticker_id
         """
 
         params = []
@@ -0,0 +1,15 @@
+from unittest.mock import patch
+
+import pytest
+
+from app.db.connection import DatabaseConnection, init_database
+
+
+@pytest.fixture
+def temp_db(tmp_path):
+    """Initialized DuckDB database in a temporary directory"""
+    database = DatabaseConnection(str(tmp_path / "metals.db"))
+    with patch("app.db.connection.db", database):
+        init_database()
+        yield database
+    database.close()
@@ -0,0 +1,75 @@
+import asyncio
+import sys
+import threading
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from app.services.bloomberg_batcher import QuoteBatcher
+from app.services.bloomberg_service import BloombergService
+
+
+class TestQuoteBatcher:
+    """Test Bloomberg request coalescing"""
+
+    async def test_concurrent_requests_share_one_fetch(self):
+        """Overlapping requests in one window result in a single Bloomberg call"""
+        batcher = QuoteBatcher()
+
+        def fake_fetch(symbols):
+            return [{"symbol": s, "px_last": 1.0} for s in symbols]
+
+        with patch(
+            "app.services.bloomberg_service.BloombergService.get_real_time_data",
+            side_effect=fake_fetch,
+        ) as mock_fetch:
+            first, second = await asyncio.gather(
+                batcher.get_quotes(["LMCADS03", "LMAHDS03"]),
+                batcher.get_quotes(["LMAHDS03", "LMZSDS03"]),
+            )
+
+        mock_fetch.assert_called_once()
+        assert sorted(mock_fetch.call_args[0][0]) == [
+            "LMAHDS03",
+            "LMCADS03",
+            "LMZSDS03",
+        ]
+        assert set(first) == {"LMCADS03", "LMAHDS03"}
+        assert set(second) == {"LMAHDS03", "LMZSDS03"}
+
+    async def test_missing_symbols_are_omitted(self):
+        """Symbols Bloomberg doesn't return are left out of the result"""
+        batcher = QuoteBatcher()
+
+        with patch(
+            "app.services.bloomberg_service.BloombergService.get_real_time_data",
+            return_value=[{"symbol": "LMCADS03", "px_last": 9568.0}],
+        ):
+            quotes = await batcher.get_quotes(["LMCADS03", "BAD"])
+
+        assert quotes == {"LMCADS03": {"symbol": "LMCADS03", "px_last": 9568.0}}
+
+    async def test_xbbg_quotes_keyed_by_requested_symbol(self):
+        """Quotes for symbols xbbg formats (e.g. "<sym> Comdty") still resolve"""
+        batcher = QuoteBatcher()
+        blp = MagicMock()
+        blp.bdp.return_value = pd.DataFrame(
+            {"PX_LAST": [9568.0], "NAME": ["Copper 3M"]}, index=["LMCADS03 Comdty"]
+        )
+        service = BloombergService.__new__(BloombergService)
+        service._startup_error = None
+        service._is_connected = True
+        service._request_lock = threading.RLock()
+
+        with patch.dict(sys.modules, {"xbbg": MagicMock(blp=blp)}), patch(
+            "app.services.bloomberg_service.BLOOMBERG_AVAILABLE", True
+        ), patch("app.services.bloomberg_service.BLOOMBERG_TYPE", "xbbg"), patch(
+            "app.services.bloomberg_batcher.get_bloomberg_service", return_value=service
+        ), patch.object(service, "_queue_real_time_write"):
+            quotes = await batcher.get_quotes(["LMCADS03"])
+
+        blp.bdp.assert_called_once()
+        assert blp.bdp.call_args.kwargs["tickers"] == ["LMCADS03 Comdty"]
+        assert list(quotes) == ["LMCADS03"]
+        assert quotes["LMCADS03"]["symbol"] == "LMCADS03"
+        assert quotes["LMCADS03"]["px_last"] == 9568.0
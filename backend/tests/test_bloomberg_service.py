@@ -1,5 +1,8 @@
 import pytest
 import os
+import queue
+import threading
+import time
 from unittest.mock import patch, MagicMock
 from datetime import datetime, timedelta
 
@@ -78,6 +81,7 @@ class TestBloombergService:
         
         mock_msg = MagicMock()
         mock_msg.hasElement.return_value = True
+        mock_msg.correlationIds.return_value = [mock_blpapi.CorrelationId.return_value]
         
         mock_security_data = MagicMock()
         mock_security_data.numValues.return_value = 1
@@ -86,11 +90,18 @@ class TestBloombergService:
         mock_security.getElementAsString.return_value = "LMCADS03 COMDTY"
         mock_security.hasElement.return_value = False  # No security errors
         
+        mock_px_last = MagicMock()
+        mock_px_last.name.return_value = "PX_LAST"
+        mock_px_last.isNull.return_value = False
+        mock_px_last.getValueAsFloat.return_value = 9568.0
+        
+        mock_name = MagicMock()
+        mock_name.name.return_value = "NAME"
+        mock_name.isNull.return_value = False
+        mock_name.getValueAsString.return_value = "Copper 3 Month"
+        
         mock_field_data = MagicMock()
-        mock_field_data.hasElement.return_value = True
-        mock_field_data.getElement.return_value.isNull.return_value = False
-        mock_field_data.getElementAsFloat.return_value = 9568.0
-        mock_field_data.getElementAsString.return_value = "Copper 3 Month"
+        mock_field_data.elements.return_value = [mock_px_last, mock_name]
         
         mock_security.getElement.return_value = mock_field_data
         mock_security_data.getValueAsElement.return_value = mock_security
@@ -132,6 +143,7 @@ class TestBloombergService:
         
         mock_msg = MagicMock()
         mock_msg.hasElement.return_value = True
+        mock_msg.correlationIds.return_value = [mock_blpapi.CorrelationId.return_value]
         
         mock_security_data = MagicMock()
         mock_security_data.hasElement.return_value = True
@@ -177,3 +189,246 @@ class TestBloombergService:
         service.close()
         
         mock_session.stop.assert_called_once()
+
+    def test_waiting_borrower_follows_reconnected_pool(self):
+        """Test a borrower waiting on a full pool picks up sessions from a new pool"""
+        service = BloombergService()
+        service._sessions = [MagicMock() for _ in range(4)]
+        fresh = MagicMock()
+        borrowed = []
+
+        def borrow():
+            with service._borrow_session() as session:
+                borrowed.append(session)
+
+        with patch('app.services.bloomberg_service.BLOOMBERG_POOL_SIZE', 4), \
+             patch('app.services.bloomberg_service.SESSION_POLL_INTERVAL', 0.05):
+            waiter = threading.Thread(target=borrow, daemon=True)
+            waiter.start()
+            time.sleep(0.1)
+
+            # What a reconnect does: a new pool with a new idle queue
+            with service._pool_lock:
+                service._sessions = [fresh]
+                service._idle = queue.Queue()
+                service._idle.put(fresh)
+
+            waiter.join(timeout=2)
+
+        assert not waiter.is_alive()
+        assert borrowed == [fresh]
+
+    def test_historical_data_after_close(self):
+        """Test fetches after close() return data and skip the cache write"""
+        points = [{"date": "2024-01-01", "price": 9500.0}]
+        service = BloombergService()
+        service._startup_error = None
+        service._is_connected = True
+        service.close()
+
+        with patch('app.services.bloomberg_service.BLOOMBERG_AVAILABLE', True), \
+             patch('app.services.bloomberg_service.BLOOMBERG_TYPE', 'xbbg'), \
+             patch.object(service, '_get_cached_historical_data', return_value=None), \
+             patch.object(service, '_get_xbbg_historical_data', return_value=points):
+            result = service.get_historical_data(
+                "LMCADS03 COMDTY", datetime(2024, 1, 1), datetime(2024, 1, 2)
+            )
+
+        assert result == points
+
+    def test_quotes_are_not_queued_after_close(self):
+        """Test quotes fetched after close() don't accumulate in the write queue"""
+        service = BloombergService()
+        service.close()
+
+        for _ in range(3):
+            service._queue_real_time_write([{"symbol": "LMCADS03 COMDTY", "px_last": 9568.0}])
+
+        assert service._pending_quotes == []
+        assert service._drain_scheduled is False
+
+    def test_reconnect_backs_off_while_down(self):
+        """Test failed reconnects are retried with exponential backoff"""
+        service = BloombergService()
+        service._startup_error = None
+
+        with patch('app.services.bloomberg_service.BLOOMBERG_AVAILABLE', True), \
+             patch('app.services.bloomberg_service.BLOOMBERG_TYPE', 'blpapi'), \
+             patch('app.services.bloomberg_service.time.monotonic') as mock_time, \
+             patch.object(service, '_initialize_bloomberg') as mock_init:
+            mock_init.side_effect = RuntimeError("Connection failed")
+
+            for now in [100.0, 101.0, 102.0, 103.0, 106.0]:
+                mock_time.return_value = now
+                assert service.get_real_time_data(["LMCADS03 COMDTY"]) == []
+
+            # Attempts at 100, 102 and 106; 101 and 103 fall inside the backoff
+            assert mock_init.call_count == 3
+            assert service._reconnect_backoff == 8.0
+
+    def test_failed_pool_growth_keeps_connection(self):
+        """Test a failed extra session leaves the working pool connected"""
+        with patch('app.services.bloomberg_service.BLOOMBERG_AVAILABLE', True), \
+             patch('app.services.bloomberg_service.BLOOMBERG_TYPE', 'blpapi'), \
+             patch('app.services.bloomberg_service.blpapi', create=True) as mock_blpapi:
+            service = BloombergService()
+            mock_blpapi.Session.return_value.start.return_value = False
+
+            assert service._grow_pool() is None
+
+        assert service._is_connected is True
+        assert len(service._sessions) == 1
+
+    def test_pool_growth_connects_outside_lock(self):
+        """Test sessions can be returned while another is still connecting"""
+        with patch('app.services.bloomberg_service.BLOOMBERG_AVAILABLE', True), \
+             patch('app.services.bloomberg_service.BLOOMBERG_TYPE', 'blpapi'), \
+             patch('app.services.bloomberg_service.blpapi', create=True) as mock_blpapi:
+            service = BloombergService()
+
+            def start():
+                # A borrower releasing its session needs the pool lock
+                assert not service._pool_lock.locked()
+                return True
+
+            mock_blpapi.Session.return_value.start.side_effect = start
+
+            assert service._grow_pool() is not None
+
+        assert len(service._sessions) == 2
+
+
+class TestPriceCache:
+    """Test caching Bloomberg prices in DuckDB"""
+
+    END_DATE = datetime(2024, 1, 30)
+    START_DATE = END_DATE - timedelta(days=29)
+
+    @pytest.fixture
+    def service(self, temp_db):
+        """Bloomberg service writing to a temporary database"""
+        temp_db.execute(
+            "INSERT INTO tickers (symbol, description, product_category) "
+            "VALUES ('LMCADS03 COMDTY', 'Copper 3 Month', 'BASE')"
+        )
+        return BloombergService()
+
+    def _history(self, days=30):
+        """Daily closes covering the test window"""
+        return [
+            {"date": (self.START_DATE + timedelta(days=i)).strftime("%Y-%m-%d"), "price": 9500.0 + i}
+            for i in range(days)
+        ]
+
+    def test_cached_history_is_returned(self, service):
+        """Test history with enough coverage is served from the cache"""
+        service._cache_historical_data("LMCADS03 COMDTY", self._history())
+
+        cached = service._get_cached_historical_data(
+            "LMCADS03 COMDTY", self.START_DATE, self.END_DATE
+        )
+
+        assert cached == self._history()
+
+    @pytest.mark.parametrize("days", [30, 365])
+    def test_weekday_history_is_a_cache_hit(self, service, days):
+        """Test weekday-only daily bars satisfy the coverage check without Bloomberg"""
+        end_date = datetime(2024, 6, 28)
+        start_date = end_date - timedelta(days=days)
+        bars = [
+            {"date": day.strftime("%Y-%m-%d"), "price": 9500.0}
+            for day in (start_date + timedelta(days=i) for i in range(days + 1))
+            if day.weekday() < 5
+        ]
+        service._cache_historical_data("LMCADS03 COMDTY", bars)
+
+        with patch('app.services.bloomberg_service.BLOOMBERG_AVAILABLE', True), \
+             patch('app.services.bloomberg_service.BLOOMBERG_TYPE', 'xbbg'), \
+             patch.object(service, '_get_xbbg_historical_data') as mock_fetch:
+            service._startup_error = None
+            service._is_connected = True
+            result = service.get_historical_data("LMCADS03 COMDTY", start_date, end_date)
+
+        assert result == bars
+        mock_fetch.assert_not_called()
+
+    def test_real_time_quotes_are_not_history(self, service):
+        """Test persisted live quotes never satisfy a history read"""
+        quote = {"symbol": "LMCADS03 COMDTY", "px_last": 9568.0}
+        with patch('app.services.bloomberg_service.datetime') as mock_datetime:
+            for i in range(30):
+                mock_datetime.now.return_value = self.START_DATE + timedelta(days=i, hours=12)
+                service._cache_real_time_data([quote])
+
+        cached = service._get_cached_historical_data(
+            "LMCADS03 COMDTY", self.START_DATE, self.END_DATE
+        )
+
+        assert cached is None
+
+    def test_coverage_counts_distinct_days(self, service):
+        """Test several bars on the same day count as one day of coverage"""
+        for i in range(10):
+            for hour in (0, 8, 16):
+                service.db.execute(
+                    "INSERT INTO price_data (ticker_id, symbol, date, px_last) "
+                    "SELECT id, symbol, ?, 9500.0 FROM tickers",
+                    [self.START_DATE + timedelta(days=i, hours=hour)],
+                )
+
+        cached = service._get_cached_historical_data(
+            "LMCADS03 COMDTY", self.START_DATE, self.END_DATE
+        )
+
+        assert cached is None
+
+    def test_cached_history_has_one_bar_per_day(self, service):
+        """Test only the latest bar of a day is returned"""
+        service._cache_historical_data("LMCADS03 COMDTY", self._history())
+        service.db.execute(
+            "INSERT INTO price_data (ticker_id, symbol, date, px_last) "
+            "SELECT id, symbol, ?, 1.0 FROM tickers",
+            [self.START_DATE + timedelta(hours=18)],
+        )
+
+        cached = service._get_cached_historical_data(
+            "LMCADS03 COMDTY", self.START_DATE, self.END_DATE
+        )
+
+        assert len(cached) == 30
+        assert cached[0] == {"date": self.START_DATE.strftime("%Y-%m-%d"), "price": 1.0}
+
+    def test_expired_history_is_not_refreshed_by_quotes(self, service):
+        """Test the TTL applies to daily bars, not to fresh live quotes"""
+        service._cache_historical_data("LMCADS03 COMDTY", self._history())
+        service.db.execute("UPDATE price_data SET updated_at = updated_at - INTERVAL 2 DAY")
+
+        quote = {"symbol": "LMCADS03 COMDTY", "px_last": 9568.0}
+        with patch('app.services.bloomberg_service.datetime') as mock_datetime:
+            for i in range(30):
+                mock_datetime.now.return_value = self.START_DATE + timedelta(days=i, hours=12)
+                service._cache_real_time_data([quote])
+
+        assert service._get_cached_historical_data(
+            "LMCADS03 COMDTY", self.START_DATE, self.END_DATE
+        ) is None
+
+        # Refetched history is served again, without the quotes mixed in
+        service._cache_historical_data("LMCADS03 COMDTY", self._history())
+        assert service._get_cached_historical_data(
+            "LMCADS03 COMDTY", self.START_DATE, self.END_DATE
+        ) == self._history()
+
+    def test_one_quote_row_per_ticker_per_day(self, service):
+        """Test repeated live quotes replace the day's previous quote"""
+        with patch('app.services.bloomberg_service.datetime') as mock_datetime:
+            for day, hour, price in [(0, 9, 9500.0), (0, 12, 9510.0), (0, 15, 9520.0), (1, 9, 9530.0)]:
+                mock_datetime.now.return_value = self.START_DATE + timedelta(days=day, hours=hour)
+                service._cache_real_time_data([{"symbol": "LMCADS03 COMDTY", "px_last": price}])
+
+        rows = service.db.fetchall("SELECT date, px_last FROM price_data ORDER BY date")
+
+        assert rows == [
+            (self.START_DATE + timedelta(hours=15), 9520.0),
+            (self.START_DATE + timedelta(days=1, hours=9), 9530.0),
+        ]
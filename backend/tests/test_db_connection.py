@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from app.db.connection import DatabaseConnection, cleanup_old_data, init_database
+
+
+class TestInitDatabase:
+    """Test schema setup and migration of existing databases"""
+
+    def test_migrates_existing_database(self, tmp_path):
+        """Existing rows keep their ids and new rows continue after them"""
+        database = DatabaseConnection(str(tmp_path / "metals.db"))
+        database.execute(
+            """
+            CREATE TABLE tickers (
+                id INTEGER PRIMARY KEY,
+                symbol VARCHAR NOT NULL UNIQUE,
+                description VARCHAR NOT NULL,
+                product_category VARCHAR NOT NULL,
+                is_custom BOOLEAN DEFAULT FALSE,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP
+            )
+        """
+        )
+        database.execute(
+            "INSERT INTO tickers (id, symbol, description, product_category) "
+            "VALUES (5, 'LMCADS03', 'Copper 3M', 'BASE')"
+        )
+
+        with patch("app.db.connection.db", database):
+            init_database()
+            init_database()
+
+        database.execute(
+            "INSERT INTO tickers (symbol, description, product_category) "
+            "VALUES ('LMAHDS03', 'Aluminium 3M', 'BASE')"
+        )
+        rows = database.fetchall("SELECT id, symbol FROM tickers ORDER BY id")
+        database.close()
+
+        assert rows == [(5, "LMCADS03"), (6, "LMAHDS03")]
+
+    def test_migrated_prices_are_not_fresh(self, tmp_path):
+        """Price rows from before updated_at existed count as expired cache"""
+        database = DatabaseConnection(str(tmp_path / "metals.db"))
+        database.execute(
+            """
+            CREATE TABLE price_data (
+                id BIGINT PRIMARY KEY,
+                ticker_id INTEGER NOT NULL,
+                symbol VARCHAR NOT NULL,
+                date TIMESTAMP NOT NULL,
+                px_last DOUBLE NOT NULL,
+                px_open DOUBLE,
+                px_high DOUBLE,
+                px_low DOUBLE,
+                px_volume DOUBLE,
+                UNIQUE(ticker_id, date)
+            )
+        """
+        )
+        database.execute(
+            "INSERT INTO price_data (id, ticker_id, symbol, date, px_last) VALUES "
+            "(1, 1, 'LMCADS03', '2024-01-02', 9500.0), "
+            "(2, 1, 'LMCADS03', '2024-01-02 10:30', 9510.0)"
+        )
+
+        with patch("app.db.connection.db", database):
+            init_database()
+
+        database.execute(
+            "INSERT INTO price_data (ticker_id, symbol, date, px_last) "
+            "VALUES (1, 'LMCADS03', '2024-01-03', 9520.0)"
+        )
+        rows = database.fetchall(
+            "SELECT id, updated_at IS NOT NULL, is_intraday FROM price_data ORDER BY id"
+        )
+        database.close()
+
+        assert rows == [(1, False, False), (2, False, True), (3, True, False)]
+
+
+class TestCleanupOldData:
+    """Test pruning old price history"""
+
+    def test_deletes_rows_before_cutoff(self, temp_db):
+        """Rows older than the cutoff are deleted and counted"""
+        now = datetime.now()
+        for age in (200, 120, 30, 0):
+            temp_db.execute(
+                "INSERT INTO price_data (ticker_id, symbol, date, px_last) "
+                "VALUES (1, 'LMCADS03', ?, 9500.0)",
+                [now - timedelta(days=age)],
+            )
+
+        assert cleanup_old_data(days=90) == 2
+        remaining = temp_db.fetchone("SELECT COUNT(*) FROM price_data")
+        assert remaining == (2,)
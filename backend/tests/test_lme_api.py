@@ -0,0 +1,26 @@
+from unittest.mock import patch
+
+from app.api import lme
+from app.models.ticker import TickerCreate
+from app.services.ticker_service import TickerService
+
+
+class TestDefaultLMETickers:
+    """Test seeding the default LME tickers"""
+
+    def test_seeding_tolerates_concurrent_inserts(self, temp_db):
+        """Defaults another request already inserted are kept and returned"""
+        service = TickerService()
+        defaults = [ticker["bloomberg_symbol"] for ticker in lme.get_lme_tickers()]
+
+        # Simulate a concurrent cold start that inserts a default between our
+        # existence check and our insert
+        symbols = service.get_all_symbols()
+        service.create_ticker(TickerCreate(symbol=defaults[0], is_custom=False))
+
+        with patch.object(lme, "ticker_service", service), patch.object(
+            service, "get_all_symbols", return_value=symbols
+        ):
+            tickers = lme.initialize_default_lme_tickers()
+
+        assert sorted(ticker.symbol for ticker in tickers) == sorted(defaults)
@@ -0,0 +1,35 @@
+from datetime import datetime, timezone
+
+from app.services.market_hours import lme_state
+
+
+def _at(iso: str) -> datetime:
+    return datetime.fromisoformat(iso).replace(tzinfo=timezone.utc)
+
+
+class TestMarketHours:
+    """Test LME schedule table"""
+
+    def test_open_during_session(self):
+        """Weekday session hours are open and report the next close"""
+        state = lme_state(_at("2026-10-14T12:34"))
+
+        assert state.is_open
+        assert state.next_close == _at("2026-10-14T19:00")
+        assert state.next_open is None
+
+    def test_friday_close_reopens_monday(self):
+        """After Friday's close the next open skips the weekend"""
+        state = lme_state(_at("2026-10-16T19:00"))
+
+        assert not state.is_open
+        assert state.message == "Market closed - After hours"
+        assert state.next_open == _at("2026-10-19T01:00")
+
+    def test_weekend(self):
+        """Weekends are closed until Monday 01:00"""
+        state = lme_state(_at("2026-10-18T23:30"))
+
+        assert not state.is_open
+        assert state.message == "Market closed - Weekend"
+        assert state.next_open == _at("2026-10-19T01:00")
@@ -0,0 +1,34 @@
+from unittest.mock import patch
+
+from app.services import price_refresher, quote_cache
+
+
+class TestPriceRefresher:
+    """Test background price snapshot"""
+
+    async def test_refresh_publishes_snapshot(self):
+        """A refresh publishes quotes for every tracked symbol"""
+        quotes = [{"symbol": "LMCADS03", "px_last": 9568.0}]
+
+        with patch(
+            "app.services.price_refresher._tracked_symbols", return_value=["LMCADS03"]
+        ), patch(
+            "app.services.bloomberg_service.BloombergService.get_real_time_data",
+            return_value=quotes,
+        ) as mock_fetch:
+            await price_refresher.refresh_once()
+
+        mock_fetch.assert_called_once_with(["LMCADS03"])
+        with patch(
+            "app.services.price_refresher._tracked_version",
+            price_refresher.TickerService.get_version(),
+        ):
+            assert price_refresher.get_snapshot() == {"LMCADS03": quotes[0]}
+        quote_cache.clear()
+
+    def test_stale_snapshot_is_unavailable(self):
+        """Callers fall back to on-demand fetches when the refresher stalls"""
+        with patch("app.services.price_refresher._last_refresh", 0.0), patch(
+            "app.services.price_refresher.time.monotonic", return_value=1000.0
+        ):
+            assert price_refresher.get_snapshot() is None
@@ -1,7 +1,11 @@
+import time
+from unittest.mock import patch
+
 import pytest
 from fastapi.testclient import TestClient
 
 from app.main import app
+from app.services import quote_cache
 
 
 class TestPricesAPI:
@@ -105,3 +109,85 @@ class TestPricesAPI:
             assert "symbol" in metal
             assert "description" in metal
             assert "category" in metal
+
+    def test_market_status_etag(self, client):
+        """Test market status supports conditional requests"""
+        response = client.get("/prices/market-status")
+        assert response.status_code == 200
+        assert "max-age=2" in response.headers["cache-control"]
+
+        etag = response.headers["etag"]
+        cached = client.get("/prices/market-status", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.headers["etag"] == etag
+
+    def test_latest_prices_etag_ignores_timestamp(self, client):
+        """Test unchanged quotes revalidate even though each response is restamped"""
+        quote_cache.set_many(
+            time.monotonic(), {"LMCADS03": {"symbol": "LMCADS03", "px_last": 9568.0}}
+        )
+        try:
+            response = client.get("/prices/latest?symbols=LMCADS03")
+            etag = response.headers["etag"]
+            cached = client.get(
+                "/prices/latest?symbols=LMCADS03", headers={"If-None-Match": etag}
+            )
+        finally:
+            quote_cache.clear()
+
+        assert cached.status_code == 304
+        assert cached.headers["etag"] == etag
+
+    def test_latest_prices_keep_request_order(self, client):
+        """Test cached and freshly fetched quotes come back in the requested order"""
+        quote_cache.set_many(
+            time.monotonic(), {"XAU=": {"symbol": "XAU=", "px_last": 2300.0}}
+        )
+        fetched = {"LMCADS03": {"symbol": "LMCADS03", "px_last": 9568.0}}
+        try:
+            with patch(
+                "app.services.bloomberg_batcher.get_quotes", return_value=fetched
+            ):
+                response = client.get("/prices/latest?symbols=LMCADS03,XAU=")
+        finally:
+            quote_cache.clear()
+
+        assert [item["symbol"] for item in response.json()] == ["LMCADS03", "XAU="]
+
+    def test_get_historical_prices_columns(self, client):
+        """Test historical prices in columnar format"""
+        raw_data = [
+            {"date": "2024-01-01", "price": 8500.0},
+            {"date": "2024-01-02", "price": 8525.5},
+        ]
+        with patch(
+            "app.services.bloomberg_service.BloombergService.get_historical_data",
+            return_value=raw_data,
+        ):
+            response = client.get("/prices/historical/LMCADS03?days=7&format=columns")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["symbol"] == "LMCADS03"
+        assert data["dates"] == ["2024-01-01", "2024-01-02"]
+        assert data["prices"] == [8500.0, 8525.5]
+        assert "data_points" not in data
+
+    def test_get_historical_prices_bulk(self, client):
+        """Test historical prices for several symbols in one request"""
+        raw_data = {
+            "LMCADS03": [{"date": "2024-01-01", "price": 8500.0}],
+            "LMAHDS03": [],
+        }
+        with patch(
+            "app.services.bloomberg_service.BloombergService.get_historical_data_bulk",
+            return_value=raw_data,
+        ) as mock_bulk:
+            response = client.get("/prices/historical?symbols=LMCADS03,LMAHDS03&days=7")
+        assert response.status_code == 200
+        assert mock_bulk.call_args[0][0] == ["LMCADS03", "LMAHDS03"]
+
+        data = response.json()
+        assert [item["symbol"] for item in data] == ["LMCADS03", "LMAHDS03"]
+        assert data[0]["data_points"] == [{"date": "2024-01-01", "price": 8500.0}]
+        assert data[1]["data_points"] == []
@@ -0,0 +1,46 @@
+from unittest.mock import patch
+
+import pytest
+
+from app.services import quote_cache
+
+
+class TestQuoteCache:
+    """Test TTL quote cache"""
+
+    @pytest.fixture(autouse=True)
+    def empty_cache(self):
+        quote_cache.clear()
+        yield
+        quote_cache.clear()
+
+    def test_fresh_quotes_are_hits(self):
+        """Quotes within the TTL are served from cache"""
+        with patch("app.services.quote_cache.time.monotonic", return_value=100.0):
+            quote_cache.set_many(100.0, {"LMCADS03": {"px_last": 9568.0}})
+            hits, misses = quote_cache.get_many(["LMCADS03", "LMAHDS03"])
+
+        assert hits == {"LMCADS03": {"px_last": 9568.0}}
+        assert misses == ["LMAHDS03"]
+
+    def test_expired_quotes_are_evicted(self):
+        """Quotes older than the TTL are misses and dropped from the cache"""
+        quote_cache.set_many(100.0, {"LMCADS03": {"px_last": 9568.0}})
+
+        with patch(
+            "app.services.quote_cache.time.monotonic",
+            return_value=100.0 + quote_cache.TTL + 1,
+        ):
+            hits, misses = quote_cache.get_many(["LMCADS03"])
+
+        assert hits == {}
+        assert misses == ["LMCADS03"]
+        assert "LMCADS03" not in quote_cache.CACHE
+
+    def test_size_is_bounded(self):
+        """Least recently used entries are evicted past MAX_ENTRIES"""
+        with patch("app.services.quote_cache.MAX_ENTRIES", 2):
+            quote_cache.set_many(100.0, {"A": {}, "B": {}})
+            quote_cache.set_many(100.0, {"C": {}})
+
+        assert list(quote_cache.CACHE) == ["B", "C"]
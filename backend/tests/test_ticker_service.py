@@ -0,0 +1,55 @@
+from app.models.ticker import TickerCreate
+from app.services.ticker_service import TickerService
+
+
+class TestTickerService:
+    """Test ticker writes against a temporary database"""
+
+    def test_create_tickers_allocates_ids(self, temp_db):
+        """A batch gets consecutive sequence ids and later inserts continue after it"""
+        service = TickerService()
+        version = TickerService.get_version()
+
+        created = service.create_tickers(
+            [
+                TickerCreate(symbol="LMCADS03"),
+                TickerCreate(symbol="LMAHDS03", description="Aluminium 3M"),
+            ]
+        )
+        single = service.create_ticker(TickerCreate(symbol="LMZSDS03"))
+
+        assert sorted(ticker.id for ticker in created) == [1, 2]
+        assert [ticker.symbol for ticker in created] == ["LMCADS03", "LMAHDS03"]
+        assert single.id == 3
+        assert service.get_ticker_by_symbol("LMAHDS03").description == "Aluminium 3M"
+        assert service.get_ticker_by_symbol("LMCADS03").description == "LMCADS03 Price"
+        assert TickerService.get_version() > version
+
+    def test_create_tickers_skips_existing_symbols(self, temp_db):
+        """Symbols created by another writer first are skipped, not a failed batch"""
+        service = TickerService()
+        service.create_ticker(TickerCreate(symbol="LMAHDS03", description="Existing"))
+
+        created = service.create_tickers(
+            [TickerCreate(symbol="LMCADS03"), TickerCreate(symbol="LMAHDS03")]
+        )
+
+        assert [ticker.symbol for ticker in created] == ["LMCADS03"]
+        assert service.get_all_symbols() == {"LMCADS03", "LMAHDS03"}
+        assert service.get_ticker_by_symbol("LMAHDS03").description == "Existing"
+
+    def test_upsert_ticker_returns_existing(self, temp_db):
+        """Upserting a known symbol returns the stored ticker without creating one"""
+        service = TickerService()
+
+        first, created = service.upsert_ticker(TickerCreate(symbol="LMCADS03"))
+        version = TickerService.get_version()
+        second, created_again = service.upsert_ticker(
+            TickerCreate(symbol="LMCADS03", description="Ignored")
+        )
+
+        assert created is True
+        assert created_again is False
+        assert second.id == first.id
+        assert second.description == "LMCADS03 Price"
+        assert TickerService.get_version() == version